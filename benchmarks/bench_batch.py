@@ -0,0 +1,47 @@
+#!/usr/bin/env python
+"""
+Benchmark converting many small HTML snippets with convert_many().
+
+Run from the repository root with ``python -m benchmarks.bench_batch``.
+"""
+import argparse
+import os
+import sys
+import time
+
+from markdownify import markdownify
+from markdownify.batch import convert_many
+
+SNIPPET = ('<div><h2>Item %d</h2><p>Some <b>bold</b> and <a href="http://example.com/%d">'
+           'linked</a> text with_underscores.</p><ul><li>one</li><li>two</li></ul></div>')
+
+
+def report(name, count, elapsed):
+    print('%-36s %8.3f s %10.0f items/s' % (name, elapsed, count / elapsed))
+
+
+def main(argv=sys.argv[1:]):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--items', type=int, default=20000)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--chunksize', type=int, default=64)
+    args = parser.parse_args(argv)
+
+    snippets = [SNIPPET % (i, i) for i in range(args.items)]
+
+    start = time.perf_counter()
+    for snippet in snippets:
+        markdownify(snippet)
+    report('markdownify() loop', args.items, time.perf_counter() - start)
+
+    for workers in sorted({1, args.workers}):
+        for ordered in (True, False):
+            start = time.perf_counter()
+            for _ in convert_many(snippets, workers=workers, chunksize=args.chunksize, ordered=ordered):
+                pass
+            report('convert_many(workers=%d%s)' % (workers, '' if ordered else ', unordered'),
+                   args.items, time.perf_counter() - start)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+#!/usr/bin/env python
+"""
+Benchmark creating a converter and converting a tiny snippet with it.
+
+Run from the repository root with ``python -m benchmarks.bench_construct``.
+This is the cost markdownify() pays on every call, as it creates a new
+converter each time.
+"""
+import argparse
+import sys
+import timeit
+
+from bs4 import BeautifulSoup
+
+from markdownify import MarkdownConverter, markdownify
+
+
+SNIPPET = '<h2>Title</h2><p>Some <b>bold</b>, <i>italic</i> and <a href="#x">a link</a>.</p>'
+
+
+def bench(name, fn, number, repeat):
+    best = min(timeit.repeat(fn, number=number, repeat=repeat))
+    print('%-28s %10.2f us' % (name, best / number * 1e6))
+
+
+def main(argv=sys.argv[1:]):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--number', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    soup = BeautifulSoup(SNIPPET, 'html.parser')
+    converter = MarkdownConverter()
+
+    bench('create converter', MarkdownConverter, args.number, args.repeat)
+    bench('convert_soup, new converter',
+          lambda: MarkdownConverter().convert_soup(soup), args.number, args.repeat)
+    bench('convert_soup, same converter',
+          lambda: converter.convert_soup(soup), args.number, args.repeat)
+    bench('markdownify()', lambda: markdownify(SNIPPET), args.number, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python
+"""
+Benchmark text escaping against applying each escape in turn.
+
+Run from the repository root with ``python -m benchmarks.bench_escape``.
+"""
+import argparse
+import sys
+import timeit
+
+from markdownify import MarkdownConverter, re_escape_misc_chars, \
+    re_escape_misc_dash_sequences, re_escape_misc_hashes, re_escape_misc_list_items
+
+TEXTS = {
+    'word': 'hello',
+    'prose': 'The quick brown fox jumps over the lazy dog while the cat sleeps.',
+    'punctuated': "It's 2024 - and we ship #1 features (see item 3.) for a+b=c & more_stuff *now*.",
+    'markup-like': '- item\n# heading\n1. first\n> quote [link](url) `code` | table |',
+}
+
+
+def escape_in_turn(text, options):
+    if options['escape_misc']:
+        text = re_escape_misc_chars.sub(r'\\\1', text)
+        text = re_escape_misc_dash_sequences.sub(r'\1\\\2', text)
+        text = re_escape_misc_hashes.sub(r'\1\\\2', text)
+        text = re_escape_misc_list_items.sub(r'\1\\\2', text)
+    if options['escape_asterisks']:
+        text = text.replace('*', r'\*')
+    if options['escape_underscores']:
+        text = text.replace('_', r'\_')
+    return text
+
+
+def main(argv=sys.argv[1:]):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--number', type=int, default=100000)
+    args = parser.parse_args(argv)
+
+    parent_tags = set()
+    for escape_misc in (False, True):
+        converter = MarkdownConverter(escape_misc=escape_misc)
+        for name, text in TEXTS.items():
+            in_turn = timeit.timeit(lambda: escape_in_turn(text, converter.options), number=args.number)
+            fused = timeit.timeit(lambda: converter.escape(text, parent_tags), number=args.number)
+            print('escape_misc=%-5s %-12s in turn %7.1f ns  fused %7.1f ns  %5.2fx'
+                  % (escape_misc, name, 1e9 * in_turn / args.number,
+                     1e9 * fused / args.number, in_turn / fused))
+
+
+if __name__ == '__main__':
+    main()
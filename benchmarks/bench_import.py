@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+"""
+Benchmark the time to import markdownify and to start the command line tool.
+
+Run from the repository root with ``python -m benchmarks.bench_import``. Each
+measurement runs a fresh interpreter with ``python -X importtime``, taking the
+cumulative import time of the module, and the best of --repeat runs is
+reported. The exit status is 1 if importing markdownify takes longer than
+--budget milliseconds.
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+
+# name: module timed (None for all the modules imported), code run in a
+# fresh interpreter
+STARTUP = (
+    ('import markdownify', 'markdownify',
+     'import markdownify'),
+    ('markdownify --help', 'markdownify.main',
+     'import markdownify.main, contextlib, io\n'
+     'with contextlib.redirect_stdout(io.StringIO()):\n'
+     '    try:\n'
+     '        markdownify.main.main(["--help"])\n'
+     '    except SystemExit:\n'
+     '        pass'),
+    ('import and convert', None,
+     'import markdownify; markdownify.markdownify("<b>x</b>")'),
+)
+
+
+def import_time(module, code, env):
+    """
+    Return the cumulative import time in seconds of module, or of all the
+    modules imported if module is None, and the names of the modules imported.
+    """
+    output = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], env=env,
+                            stderr=subprocess.PIPE, check=True).stderr.decode()
+    cumulative = 0
+    modules = set()
+    for line in output.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        if not cumulative_us.strip().isdigit():
+            continue  # the header line
+        modules.add(name.strip())
+        if name.strip() == module or (module is None and not name.startswith('  ', 1)):
+            cumulative += int(cumulative_us) / 1e6
+    return cumulative, modules
+
+
+def main(argv=sys.argv[1:]):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--budget', type=float, default=30.0,
+                        help="The time in milliseconds that importing markdownify "
+                        "may take.")
+    args = parser.parse_args(argv)
+
+    # Measure with compiled bytecode, as for an installed package.
+    env = dict(os.environ)
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    env['PYTHONPATH'] = os.pathsep.join([os.getcwd()] + sys.path)
+
+    status = 0
+    for name, module, code in STARTUP:
+        import_time(module, code, env)  # warm up the bytecode cache
+        times = []
+        for _ in range(args.repeat):
+            elapsed, modules = import_time(module, code, env)
+            times.append(elapsed)
+        best = min(times)
+        print('%-20s %8.1f ms  bs4 %s' % (name, best * 1e3,
+                                          'imported' if 'bs4' in modules else 'not imported'))
+        if name == 'import markdownify' and best * 1e3 > args.budget:
+            print('import markdownify is over the budget of %.1f ms' % args.budget)
+            status = 1
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+"""
+Benchmark reconverting a document after a small edit with ConvertedDocument.
+
+Run from the repository root with ``python -m benchmarks.bench_incremental``.
+Both the conversion and the update include parsing the document, whose time
+is also reported.
+"""
+import argparse
+import sys
+import time
+
+from markdownify import MarkdownConverter
+from markdownify.incremental import ConvertedDocument
+from .corpora import prose
+
+
+def best_time(fn, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main(argv=sys.argv[1:]):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--paragraphs', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    html = prose(args.paragraphs)
+    # Edit one paragraph in the middle of the document.
+    middle = html.index('<p>', len(html) // 2)
+    edited = html[:middle + 3] + 'Edited. ' + html[middle + 3:]
+
+    converter = MarkdownConverter()
+    parse, soup = best_time(lambda: converter._parse(edited), args.repeat)
+    print('%-24s %10.4f s' % ('parse', parse))
+    full, expected = best_time(lambda: converter.convert(edited), args.repeat)
+    print('%-24s %10.4f s' % ('convert', full))
+
+    document = ConvertedDocument(converter, html)
+
+    def update():
+        document.update(html)
+        return document.update(edited)
+    incremental, markdown = best_time(update, args.repeat)
+    print('%-24s %10.4f s' % ('update', incremental / 2))
+    if markdown != expected:
+        print('incremental output differs')
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
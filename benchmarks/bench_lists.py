@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+"""
+Benchmark conversion of long ordered and unordered lists.
+
+Run from the repository root with ``python -m benchmarks.bench_lists``.
+The conversion time must grow linearly with the number of list items; the
+exit status is 1 if it grows faster than --max-exponent.
+"""
+import argparse
+import math
+import sys
+import time
+
+from bs4 import BeautifulSoup
+
+from markdownify import MarkdownConverter
+
+
+def long_list(tag, items):
+    return '<%s>%s</%s>' % (tag, '<li>item</li>' * items, tag)
+
+
+def nested_list(tag, items):
+    return '<%s><li>outer%s</li></%s>' % (tag, long_list(tag, items), tag)
+
+
+def measure(html, repeat):
+    soup = BeautifulSoup(html, 'html.parser')
+    converter = MarkdownConverter()
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        converter.convert_soup(soup)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main(argv=sys.argv[1:]):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--items', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--max-exponent', type=float, default=1.3)
+    args = parser.parse_args(argv)
+
+    failed = False
+    for name, make in (('ol', lambda n: long_list('ol', n)),
+                       ('ul', lambda n: long_list('ul', n)),
+                       ('nested ol', lambda n: nested_list('ol', n))):
+        small = measure(make(args.items), args.repeat)
+        large = measure(make(4 * args.items), args.repeat)
+        exponent = math.log(large / small, 4)
+        failed = failed or exponent > args.max_exponent
+        print('%-10s %8d items %8.4f s %8d items %8.4f s  growth n^%.2f'
+              % (name, args.items, small, 4 * args.items, large, exponent))
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
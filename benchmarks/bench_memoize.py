@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+"""
+Benchmark the memoize_subtrees option on a page of repeated blocks.
+
+Run from the repository root with ``python -m benchmarks.bench_memoize``.
+"""
+import argparse
+import sys
+import time
+
+from bs4 import BeautifulSoup
+
+from markdownify import MarkdownConverter
+
+
+NAV = ('<nav><ul><li><a href="/">Home</a></li><li><a href="/shop">Shop</a></li>'
+       '<li><a href="/about">About <b>us</b></a></li></ul></nav>')
+
+CARD = ('<div class="card"><h3>Product</h3><img src="p.png" alt="Product">'
+        '<p>A <em>fine</em> product, at a <strong>low</strong> price.</p>'
+        '<table><tr><th>Size</th><th>Price</th></tr><tr><td>S</td><td>10</td></tr></table>'
+        '<a href="/buy">Buy now</a></div>')
+
+
+def page(cards):
+    return '<html><body>' + (NAV + CARD * 10) * (cards // 10) + '</body></html>'
+
+
+def bench(name, soup, repeat, **options):
+    converter = MarkdownConverter(**options)
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        markdown = converter.convert_soup(soup)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    print('%-24s %10.4f s' % (name, best))
+    return markdown
+
+
+def main(argv=sys.argv[1:]):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--cards', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    soup = BeautifulSoup(page(args.cards), 'html.parser')
+    plain = bench('not memoized', soup, args.repeat)
+    memoized = bench('memoize_subtrees=True', soup, args.repeat, memoize_subtrees=True)
+    if plain != memoized:
+        print('memoized output differs')
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
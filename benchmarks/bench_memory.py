@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+"""
+Measure the memory allocated converting a large document, with tracemalloc.
+
+Run from the repository root with ``python -m benchmarks.bench_memory``.
+The document is parsed before tracing starts, so only the conversion is
+measured. Besides the peak traced memory, the number of garbage collections
+during the conversion shows the pressure of short-lived container objects.
+"""
+import argparse
+import gc
+import sys
+import time
+import tracemalloc
+
+from bs4 import BeautifulSoup
+
+from markdownify import MarkdownConverter
+
+
+def document(sections):
+    section = (
+        '<div class="section"><h2>Title <em>here</em></h2>'
+        '<p>Some <b>bold</b> and <i>italic</i> text with <a href="#x">a link</a>.</p>'
+        '<ul><li>one</li><li>two <code>code</code></li><li>three</li></ul>'
+        '<table><tr><th>a</th><th>b</th></tr><tr><td>1</td><td>2</td></tr></table>'
+        '</div>'
+    )
+    return '<html><body>' + section * sections + '</body></html>'
+
+
+def main(argv=sys.argv[1:]):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sections', type=int, default=5000)
+    args = parser.parse_args(argv)
+
+    soup = BeautifulSoup(document(args.sections), 'html.parser')
+    tags = len(soup.find_all(True))
+    converter = MarkdownConverter()
+
+    start = time.perf_counter()
+    converter.convert_soup(soup)
+    elapsed = time.perf_counter() - start
+
+    collections = gc.get_stats()[0]['collections']
+    tracemalloc.start()
+    converter.convert_soup(soup)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    collections = gc.get_stats()[0]['collections'] - collections
+
+    print('tags converted       %10d' % tags)
+    print('peak traced memory   %10d bytes (%.1f per tag)' % (peak, peak / tags))
+    print('gen 0 collections    %10d' % collections)
+    print('time (untraced)      %10.4f s' % elapsed)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+"""
+Benchmark the peak memory of converting a large HTML file, by input type.
+
+Run from the repository root with ``python -m benchmarks.bench_rss``; the
+request that motivated accepting binary files measured a 500 MB file, with
+``--megabytes 500``. Each input type is converted in a fresh interpreter, and
+the peak resident set size of that process is reported: the file read and
+decoded into text, read as bytes, and passed as a binary file object, which
+the converter maps into memory.
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+from .corpora import prose
+
+
+# name: code reading the file at path into the html passed to convert()
+INPUTS = (
+    ('text (read, decoded)', "html = open(path, encoding='utf-8').read()"),
+    ('bytes (read)', "html = open(path, 'rb').read()"),
+    ('binary file (mmap)', "html = open(path, 'rb')"),
+)
+
+CHILD = '''
+import resource, sys
+from markdownify import MarkdownConverter
+path = sys.argv[1]
+converter = MarkdownConverter()
+%s
+markdown = converter.convert(html)
+print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, len(markdown))
+'''
+
+
+def write_document(path, megabytes):
+    """Write an HTML document of about megabytes MB to path."""
+    block = prose(1000)
+    block = block[block.index('<article>') + len('<article>'):block.rindex('</article>')]
+    block = block.replace('example', 'examplé').encode('utf-8')
+    with open(path, 'wb') as f:
+        f.write(b'<html><body><article>')
+        for _ in range(max(1, int(megabytes * 1e6 / len(block)))):
+            f.write(block)
+        f.write(b'</article></body></html>')
+
+
+def peak_rss(code, path, env):
+    """Return the peak RSS in MB of converting path in a fresh interpreter, and the Markdown length."""
+    output = subprocess.run([sys.executable, '-c', CHILD % code, path], env=env,
+                            stdout=subprocess.PIPE, check=True).stdout.decode()
+    maxrss, length = output.split()
+    # (ru_maxrss is in kilobytes on Linux, and in bytes on macOS)
+    scale = 1e6 if sys.platform == 'darwin' else 1e3
+    return int(maxrss) / scale, int(length)
+
+
+def main(argv=sys.argv[1:]):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--megabytes', type=float, default=20.0)
+    args = parser.parse_args(argv)
+
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join([os.getcwd()] + sys.path)
+
+    fd, path = tempfile.mkstemp(suffix='.html')
+    os.close(fd)
+    try:
+        write_document(path, args.megabytes)
+        print('document %.1f MB' % (os.path.getsize(path) / 1e6))
+        lengths = set()
+        for name, code in INPUTS:
+            rss, length = peak_rss(code, path, env)
+            lengths.add(length)
+            print('%-24s peak RSS %8.1f MB' % (name, rss))
+        if len(lengths) != 1:
+            print('outputs differ')
+            return 1
+    finally:
+        os.unlink(path)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+"""
+Benchmark the peak memory and time of converting a large document in chunks.
+
+Run from the repository root with ``python -m benchmarks.bench_stream``. The
+document is converted whole with convert(), and in chunks of --chunk-size
+characters with markdownify.stream.iter_convert_chunks(); the peak memory is
+traced by tracemalloc, and includes the document itself.
+"""
+import argparse
+import sys
+import time
+import tracemalloc
+
+from markdownify import MarkdownConverter
+from markdownify.stream import iter_convert_chunks
+from .corpora import prose
+
+
+def measure(name, fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    markdown = fn()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print('%-24s %8.3f s  peak %8.1f MB' % (name, elapsed, peak / 1e6))
+    return markdown
+
+
+def main(argv=sys.argv[1:]):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--paragraphs', type=int, default=20000)
+    parser.add_argument('--chunk-size', type=int, default=65536)
+    args = parser.parse_args(argv)
+
+    html = prose(args.paragraphs)
+    print('document %.1f MB' % (len(html) / 1e6))
+    converter = MarkdownConverter()
+
+    def chunks():
+        for start in range(0, len(html), args.chunk_size):
+            yield html[start:start + args.chunk_size]
+
+    whole = measure('convert', lambda: converter.convert(html))
+    streamed = measure('iter_convert_chunks', lambda: ''.join(iter_convert_chunks(converter, chunks())))
+    if whole != streamed:
+        print('streamed output differs')
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+"""
+Benchmark conversion of tables with many rows and sections.
+
+Run from the repository root with ``python -m benchmarks.bench_tables``.
+The conversion time must grow linearly with the number of rows; the exit
+status is 1 if it grows faster than --max-exponent.
+"""
+import argparse
+import math
+import sys
+import time
+
+from bs4 import BeautifulSoup
+
+from markdownify import MarkdownConverter
+
+ROW = '<tr><td>a</td><td colspan="2">b</td></tr>\n'
+
+
+def plain_table(rows):
+    return '<table>%s</table>' % (ROW * rows)
+
+
+def head_table(rows):
+    return '<table><thead>%s</thead></table>' % (ROW * rows)
+
+
+def sectioned_table(rows):
+    return '<table><thead>%s</thead>%s</table>' % (ROW, ('<tbody>%s</tbody>' % ROW) * rows)
+
+
+def measure(html, repeat, **options):
+    soup = BeautifulSoup(html, 'html.parser')
+    converter = MarkdownConverter(**options)
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        converter.convert_soup(soup)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main(argv=sys.argv[1:]):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--max-exponent', type=float, default=1.3)
+    args = parser.parse_args(argv)
+
+    failed = False
+    for name, make in (('table', plain_table),
+                       ('thead', head_table),
+                       ('tbodies', sectioned_table)):
+        for infer in (False, True):
+            small = measure(make(args.rows), args.repeat, table_infer_header=infer)
+            large = measure(make(4 * args.rows), args.repeat, table_infer_header=infer)
+            exponent = math.log(large / small, 4)
+            failed = failed or exponent > args.max_exponent
+            print('%-8s infer=%-5s %8d rows %8.4f s %8d rows %8.4f s  growth n^%.2f'
+                  % (name, infer, args.rows, small, 4 * args.rows, large, exponent))
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,43 @@
+#!/usr/bin/env python
+"""
+Benchmark process_text() on the text nodes of the synthetic corpora.
+
+Run from the repository root with ``python -m benchmarks.bench_text``. For each
+corpus, the time per text node is reported, with the share of the text nodes
+that are already normalized, for which process_text() skips the whitespace
+normalization.
+"""
+import argparse
+import sys
+import time
+
+from markdownify import MarkdownConverter
+from .corpora import CORPORA
+
+
+def normalized(text):
+    return not ('  ' in text or '\n' in text or '\t' in text or '\r' in text)
+
+
+def main(argv=sys.argv[1:]):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    for name, (corpus, scale, options) in CORPORA.items():
+        for escape_misc in (False, True):
+            converter = MarkdownConverter(escape_misc=escape_misc, **options)
+            texts = converter._parse(corpus(scale)).find_all(string=True)
+            best = float('inf')
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                for text in texts:
+                    converter.process_text(text)
+                best = min(best, time.perf_counter() - start)
+            share = sum(map(normalized, texts)) / max(len(texts), 1)
+            print('%-8s escape_misc=%-5s %8d nodes %7.2f us/node  %3.0f%% normalized'
+                  % (name, escape_misc, len(texts), 1e6 * best / max(len(texts), 1), 100 * share))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+#!/usr/bin/env python
+"""
+Benchmark conversion of deep and wide synthetic trees.
+
+Run from the repository root with ``python -m benchmarks.bench_tree``.
+"""
+import argparse
+import sys
+import time
+
+from bs4 import BeautifulSoup
+
+from markdownify import MarkdownConverter
+
+
+def deep_tree(depth):
+    return '<div>' * depth + '<span>text</span>' + '</div>' * depth
+
+
+def wide_tree(width):
+    return '<div>' + '<p>some <b>bold</b> text</p>' * width + '</div>'
+
+
+def bench(name, html, repeat):
+    soup = BeautifulSoup(html, 'html.parser')
+    converter = MarkdownConverter()
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        converter.convert_soup(soup)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    print('%-20s %10.4f s' % (name, best))
+
+
+def main(argv=sys.argv[1:]):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--depth', type=int, default=2000)
+    parser.add_argument('--width', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    bench('deep (%d)' % args.depth, deep_tree(args.depth), args.repeat)
+    bench('wide (%d)' % args.width, wide_tree(args.width), args.repeat)
+
+
+if __name__ == '__main__':
+    main()
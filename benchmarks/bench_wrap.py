@@ -0,0 +1,44 @@
+#!/usr/bin/env python
+"""
+Benchmark paragraph wrapping against textwrap.fill.
+
+Run from the repository root with ``python -m benchmarks.bench_wrap``.
+"""
+import argparse
+import sys
+import textwrap
+import timeit
+
+from markdownify import MarkdownConverter, _fill
+from .corpora import prose
+
+TEXTS = {
+    'short': 'A short paragraph.',
+    'sentence': 'The quick brown fox jumps over the lazy dog while the cat sleeps in the sun.',
+    'paragraph': ' '.join(['Lorem ipsum dolor sit amet, consectetur adipiscing elit.'] * 12),
+    'links': ' '.join(['See [the docs](http://example.com/docs/page) and `code()`.'] * 10),
+}
+
+
+def main(argv=sys.argv[1:]):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--number', type=int, default=20000)
+    parser.add_argument('--width', type=int, default=80)
+    args = parser.parse_args(argv)
+
+    for name, text in TEXTS.items():
+        wrapped = timeit.timeit(lambda: textwrap.fill(text, width=args.width, break_long_words=False,
+                                                      break_on_hyphens=False), number=args.number)
+        filled = timeit.timeit(lambda: _fill(text, args.width), number=args.number)
+        print('%-12s textwrap %8.2f us  _fill %8.2f us  %5.2fx'
+              % (name, 1e6 * wrapped / args.number, 1e6 * filled / args.number, wrapped / filled))
+
+    html = prose(500)
+    for options in ({}, {'wrap': True, 'wrap_width': 80}):
+        converter = MarkdownConverter(**options)
+        elapsed = min(timeit.repeat(lambda: converter.convert(html), number=1, repeat=5))
+        print('prose %-36s %8.4f s' % (options, elapsed))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""
+Synthetic HTML corpora for the benchmarks.
+
+Each corpus is a function of a scale, returning one HTML document whose size
+grows linearly with the scale; CORPORA maps the corpus names to them, with
+the converter options each is benchmarked with.
+"""
+import random
+
+
+WORDS = ('the quick brown fox jumps over a lazy dog while markdown_style '
+         'text *with* some 1. numbered #hash and [bracketed] words').split()
+
+
+def _words(rng, count):
+    return ' '.join(rng.choice(WORDS) for _ in range(count))
+
+
+def deep(scale):
+    """Nested <div> and <blockquote> elements, scale levels deep."""
+    return ('<div><blockquote>' * (scale // 2) + '<p>deep <b>text</b></p>'
+            + '</blockquote></div>' * (scale // 2))
+
+
+def lists(scale):
+    """One long ordered list, and nested unordered lists."""
+    items = ''.join('<li>item <em>%d</em></li>' % i for i in range(scale))
+    nested = '<ul><li>a<ul><li>b<ul><li>c</li></ul></li></ul></li></ul>' * (scale // 10)
+    return '<ol start="3">%s</ol>%s' % (items, nested)
+
+
+def tables(scale):
+    """One long table with a header, and small tables without one."""
+    rows = ''.join('<tr><td>%d</td><td>cell <b>b</b></td><td colspan="2">wide</td></tr>' % i
+                   for i in range(scale))
+    small = '<table><tr><td>a</td><td>b</td></tr><tr><td>c</td><td>d</td></tr></table>' * (scale // 10)
+    return ('<table><thead><tr><th>n</th><th>text</th><th>x</th><th>y</th></tr></thead>'
+            '<tbody>%s</tbody></table>%s' % (rows, small))
+
+
+def prose(scale):
+    """Paragraphs and headings of text with inline markup and links."""
+    rng = random.Random(scale)
+    parts = []
+    for i in range(scale):
+        if i % 10 == 0:
+            parts.append('<h2>%s</h2>' % _words(rng, 4))
+        parts.append('<p>%s <a href="http://example.com/%d">%s</a> %s <strong>%s</strong>.</p>'
+                     % (_words(rng, 20), i, _words(rng, 2), _words(rng, 15), _words(rng, 3)))
+    return '<html><body><article>%s</article></body></html>' % ''.join(parts)
+
+
+def code(scale):
+    """Code blocks and inline code between short paragraphs."""
+    block = ('<pre><code class="language-python">def f(x):\n    return x * 2  # a_b\n\n\n'
+             'print(f(1))\n</code></pre>')
+    return ''.join('<p>Call <code>f(%d)</code>, <kbd>Ctrl</kbd>+<kbd>C</kbd>:</p>%s' % (i, block)
+                   for i in range(scale))
+
+
+# name: (corpus, scale, options)
+CORPORA = {
+    'deep': (deep, 2000, {}),
+    'lists': (lists, 5000, {}),
+    'tables': (tables, 3000, {}),
+    'prose': (prose, 2000, {}),
+    'code': (code, 3000, {}),
+    'wrap': (prose, 2000, {'wrap': True, 'wrap_width': 72}),
+}
@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+"""
+Run the benchmark suite over the synthetic corpora.
+
+Run from the repository root with ``python -m benchmarks.suite``. For each
+corpus of benchmarks.corpora it measures the parse and convert times (the
+best of --repeat runs), the tags converted per second and the peak memory
+traced during a conversion. The results are written as JSON with --json,
+and compared with the JSON results of another commit with --compare; the
+exit status is then 1 if any conversion is slower by more than --threshold.
+"""
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from bs4 import BeautifulSoup
+
+from markdownify import MarkdownConverter
+from .corpora import CORPORA
+
+
+def best_time(fn, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def run(name, scale_factor, repeat):
+    corpus, scale, options = CORPORA[name]
+    html = corpus(int(scale * scale_factor))
+    converter = MarkdownConverter(**options)
+    soup = BeautifulSoup(html, 'html.parser')
+    tags = len(soup.find_all(True))
+
+    parse = best_time(lambda: BeautifulSoup(html, 'html.parser'), repeat)
+    convert = best_time(lambda: converter.convert_soup(soup), repeat)
+
+    tracemalloc.start()
+    converter.convert_soup(soup)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        'options': options,
+        'html_bytes': len(html.encode('utf-8')),
+        'tags': tags,
+        'parse_s': parse,
+        'convert_s': convert,
+        'tags_per_s': tags / convert,
+        'peak_memory_bytes': peak,
+    }
+
+
+def revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'],
+                                       stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline, threshold):
+    """Print the convert time ratios to baseline; return whether any regressed."""
+    regressed = False
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        ratio = result['convert_s'] / baseline[name]['convert_s']
+        slower = ratio > 1 + threshold
+        regressed = regressed or slower
+        print('%-8s convert %8.4f s, was %8.4f s: x%.2f%s'
+              % (name, result['convert_s'], baseline[name]['convert_s'], ratio,
+                 '  SLOWER' if slower else ''))
+    return regressed
+
+
+def main(argv=sys.argv[1:]):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('corpora', nargs='*',
+                        help="The corpora to run, by default all of them: %s."
+                        % ', '.join(sorted(CORPORA)))
+    parser.add_argument('--scale', type=float, default=1.0,
+                        help="Multiply the size of every corpus by this factor.")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--json', metavar='FILE',
+                        help="Write the results as JSON to FILE ('-' for stdout).")
+    parser.add_argument('--compare', metavar='FILE',
+                        help="Compare the results with the JSON results in FILE.")
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help="The fraction by which a conversion may be slower "
+                        "than in --compare before it is reported as a regression.")
+    args = parser.parse_args(argv)
+    unknown = set(args.corpora) - set(CORPORA)
+    if unknown:
+        parser.error('unknown corpora: %s' % ', '.join(sorted(unknown)))
+
+    results = {}
+    for name in args.corpora or sorted(CORPORA):
+        result = results[name] = run(name, args.scale, args.repeat)
+        print('%-8s %7d tags  parse %8.4f s  convert %8.4f s  %9.0f tags/s  peak %6.1f MB'
+              % (name, result['tags'], result['parse_s'], result['convert_s'],
+                 result['tags_per_s'], result['peak_memory_bytes'] / 1e6),
+              file=sys.stderr if args.json == '-' else sys.stdout)
+
+    report = {
+        'revision': revision(),
+        'python': platform.python_version(),
+        'scale': args.scale,
+        'results': results,
+    }
+    if args.json == '-':
+        json.dump(report, sys.stdout, indent=2, sort_keys=True)
+        print()
+    elif args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)['results']
+        if compare(results, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,7 +1,16 @@
-from bs4 import BeautifulSoup, Comment, Doctype, NavigableString, Tag
-from textwrap import fill
+import codecs
+import functools
+import io
+import mmap
+import os
 import re
-import six
+import stat
+from types import MappingProxyType
+
+
+# The names imported from bs4 by _import_bs4(), on first use
+_bs4_names = ('BeautifulSoup', 'Comment', 'Doctype', 'NavigableString', 'Tag')
+_bs4_imported = False
 
 
 # General-purpose regex patterns
@@ -20,7 +29,8 @@ re_make_convert_fn_name = re.compile(r'[\[\]:-]')
 re_extract_newlines = re.compile(r'^(\n*)((?:.*[^\n])?)(\n*)$', flags=re.DOTALL)
 
 # Escape miscellaneous special Markdown characters
-re_escape_misc_chars = re.compile(r'([]\\&<`[>~=+|])')
+escape_misc_chars = r']\\&<`[>~=+|'
+re_escape_misc_chars = re.compile(r'([%s])' % escape_misc_chars)
 
 # Escape sequence of one or more consecutive '-', preceded
 # and followed by whitespace or start/end of fragment, as it
@@ -37,6 +47,33 @@ re_escape_misc_hashes = re.compile(r'(\s|^)(#{1,6}(?:\s|$))')
 # confused with a list item
 re_escape_misc_list_items = re.compile(r'((?:\s|^)[0-9]{1,9})([.)](?:\s|$))')
 
+# All of the above escapes, and the escaping of '*' and '_', in a single
+# pattern (see _compile_escape_misc()), matching where a backslash is to be
+# inserted. Lookbehind assertions replace the whitespace and digits that the
+# separate patterns consume before the escaped text, so that the escapes do
+# not interfere with each other. As the separate dash, hash and list item
+# patterns consume the whitespace after a match, a match directly following
+# another one is not escaped; the optional second sequences reproduce this.
+fused_escape_misc_alternatives = (
+    # sequence of '-'
+    r'(?<!\S)-+(?:\s-+)?(?=\s|$)',
+    # sequence of up to six '#'
+    r'(?<!\S)#{1,6}(?:\s#{1,6})?(?=\s|$)',
+    # '.' or ')' preceded by up to nine digits
+    r'(?<=[0-9])(?:%s)[.)](?:\s[0-9]{1,9}[.)])?(?=\s|$)'
+    % '|'.join(r'(?<=(?<!\S)[0-9]{%d})' % n for n in range(1, 10)),
+)
+
+# Split text to wrap into words and runs of spaces
+re_wrap_chunks = re.compile(r'( +)')
+re_wrap_spaces = re.compile(r' *')
+
+# Whitespace other than spaces, left in text to wrap after the translation
+re_wrap_unusual_whitespace = re.compile(r'[^\S ]')
+
+# Whitespace characters replaced by spaces before wrapping, as by textwrap
+wrap_whitespace_table = str.maketrans('\n\x0b\x0c\r', '    ')
+
 # Heading styles
 ATX = 'atx'
 ATX_CLOSED = 'atx_closed'
@@ -57,6 +94,26 @@ RSTRIP = 'rstrip'
 STRIP = 'strip'
 
 
+def _import_bs4():
+    """
+    Import the bs4 names into the module globals. Importing bs4 (and with it
+    its parser registry) dominates the time to import markdownify, so it is
+    deferred until a converter is created or a bs4 name is looked up.
+    """
+    global _bs4_imported, BeautifulSoup, Comment, Doctype, NavigableString, Tag
+    if not _bs4_imported:
+        from bs4 import BeautifulSoup, Comment, Doctype, NavigableString, Tag
+        _bs4_imported = True
+
+
+def __getattr__(name):
+    # Resolve markdownify.Tag and the other bs4 names before their import
+    if name in _bs4_names:
+        _import_bs4()
+        return globals()[name]
+    raise AttributeError('module %r has no attribute %r' % (__name__, name))
+
+
 def chomp(text):
     """
     If the text in an inline tag like b, a, or em contains a leading or trailing
@@ -93,27 +150,196 @@ def abstract_inline_conversion(markup_fn):
     return implementation
 
 
+_fused_escape_misc_cache = {}
+
+
+def _escape_match(match):
+    # (a function is faster than the equivalent template r'\\\g<0>')
+    return '\\' + match.group()
+
+
+def _compile_escape_misc(escape_asterisks, escape_underscores):
+    """
+    Return a function applying the escape_misc escapes, and the escaping of
+    '*' and '_' as enabled, to a text in a single regular expression
+    substitution. The result equals that of applying them in turn.
+    """
+    key = (escape_asterisks, escape_underscores)
+    if key not in _fused_escape_misc_cache:
+        chars = (escape_misc_chars
+                 + ('*' if escape_asterisks else '')
+                 + ('_' if escape_underscores else ''))
+        # Start with a lookahead for the first character of any match, which
+        # lets the regular expression engine skip other characters quickly.
+        pattern = re.compile(r'(?=[%s#.)-])(?:[%s]|%s)'
+                             % (chars, chars, '|'.join(fused_escape_misc_alternatives)))
+        _fused_escape_misc_cache[key] = functools.partial(pattern.sub, _escape_match)
+    return _fused_escape_misc_cache[key]
+
+
+def _fill(text, width):
+    """
+    Wrap text into lines of at most width characters, breaking only at
+    spaces, and return them joined by newlines.
+
+    The result is that of textwrap.fill(text, width, break_long_words=False,
+    break_on_hyphens=False): words longer than width, such as long link
+    destinations or inline code, are kept whole on a line of their own.
+    """
+    if width <= 0:
+        raise ValueError("invalid width %r (must be > 0)" % (width,))
+    if '\t' in text:
+        text = text.expandtabs()
+    text = text.translate(wrap_whitespace_table)
+
+    # A text that fits is a single line, without trailing whitespace.
+    if len(text) <= width and not text[-1:].isspace():
+        return text
+    if text[:1] == ' ' or re_wrap_unusual_whitespace.search(text):
+        return _fill_chunks(text, width)
+
+    # Break each line at the last space that leaves it at most width long,
+    # or after the first word if it is longer than width.
+    length = len(text)
+    lines = []
+    start = 0
+    while start < length:
+        # Drop the spaces at the start of every line but the first.
+        if lines:
+            start = re_wrap_spaces.match(text, start).end()
+            if start == length:
+                break
+        limit = start + width
+        if limit >= length:
+            end = length
+        elif text[limit] == ' ' or text[limit - 1] == ' ':
+            end = limit
+        else:
+            end = text.rfind(' ', start, limit) + 1
+            if not end:
+                end = text.find(' ', limit)
+                if end < 0:
+                    end = length
+        # Drop the spaces at the end of the line.
+        lines.append(text[start:end].rstrip(' '))
+        start = end
+    return '\n'.join(lines)
+
+
+def _fill_chunks(text, width):
+    """
+    Wrap text like _fill(), by chunks of words and spaces as textwrap does,
+    for texts starting with a space or containing whitespace other than
+    spaces.
+    """
+    chunks = [chunk for chunk in re_wrap_chunks.split(text) if chunk]
+    count = len(chunks)
+    lines = []
+    i = 0
+    while i < count:
+        # Drop the whitespace at the start of every line but the first.
+        if lines and chunks[i].isspace():
+            i += 1
+
+        # Fill the line with as many chunks as fit, or with a single word
+        # that does not fit on any line.
+        start = i
+        length = 0
+        while i < count and length + len(chunks[i]) <= width:
+            length += len(chunks[i])
+            i += 1
+        if i == start and i < count and len(chunks[i]) > width:
+            i += 1
+
+        # Drop the whitespace at the end of the line.
+        end = i
+        if end > start and chunks[end - 1].isspace():
+            end -= 1
+        if end > start:
+            lines.append(''.join(chunks[start:end]))
+    return '\n'.join(lines)
+
+
 def _todict(obj):
     return dict((k, getattr(obj, k)) for k in dir(obj) if not k.startswith('_'))
 
 
+_class_options_cache = {}
+
+
+def _class_options(cls):
+    """
+    Return the options of the converter class cls, from its DefaultOptions
+    and Options classes, computed again only when the attributes of these
+    classes or of their bases have changed, as when an application sets
+    MarkdownConverter.DefaultOptions.bullets.
+    """
+    key = (cls.DefaultOptions, cls.Options)
+    cached = _class_options_cache.get(key)
+    if cached is not None:
+        classes, attributes, options = cached
+        for c, class_attributes in zip(classes, attributes):
+            if c.__dict__ != class_attributes:
+                break
+        else:
+            return options
+
+    # (but object, each class of the MRO of both classes, once)
+    classes = cls.DefaultOptions.__mro__[:-1] + tuple(
+        c for c in cls.Options.__mro__[:-1] if c not in cls.DefaultOptions.__mro__)
+    options = _todict(cls.DefaultOptions)
+    options.update(_todict(cls.Options))
+    _class_options_cache[key] = (classes, [dict(c.__dict__) for c in classes], options)
+    return options
+
+
+@functools.lru_cache(maxsize=1024)
+def _conv_fn_dispatch(tag_name):
+    """
+    Return (name, n, convert_fn_name) for the tag name tag_name: its lower
+    case name, its heading level n or None if it is not a heading, and the
+    name of its conversion function, computed once per tag name.
+    """
+    tag_name = tag_name.lower()
+    match = re_html_heading.match(tag_name)
+    n = int(match.group(1)) if match else None
+    return tag_name, n, "convert_%s" % re_make_convert_fn_name.sub('_', tag_name)
+
+
+# Whether whitespace is removed immediately inside tags of these names, for
+# the block-level tags and the common tags whose names start with 'h'. Other
+# names are looked up by _removes_whitespace_inside().
+_whitespace_block_tags = dict.fromkeys(('p', 'blockquote',
+                                        'article', 'div', 'section',
+                                        'ol', 'ul', 'li',
+                                        'dl', 'dt', 'dd',
+                                        'table', 'thead', 'tbody', 'tfoot',
+                                        'tr', 'td', 'th',
+                                        'h1', 'h2', 'h3', 'h4', 'h5', 'h6'), True)
+_whitespace_block_tags.update(dict.fromkeys(('head', 'header', 'hgroup', 'hr', 'html'), False))
+
+
+def _removes_whitespace_inside(name):
+    """Return whether whitespace is removed immediately inside tags named name."""
+    block = _whitespace_block_tags.get(name)
+    if block is None:
+        # Only headings, matched by re_html_heading, start with 'h'.
+        block = name[:1] == 'h' and re_html_heading.match(name) is not None
+    return block
+
+
 def should_remove_whitespace_inside(el):
     """Return to remove whitespace immediately inside a block-level element."""
     if not el or not el.name:
         return False
-    if re_html_heading.match(el.name) is not None:
-        return True
-    return el.name in ('p', 'blockquote',
-                       'article', 'div', 'section',
-                       'ol', 'ul', 'li',
-                       'dl', 'dt', 'dd',
-                       'table', 'thead', 'tbody', 'tfoot',
-                       'tr', 'td', 'th')
+    return _removes_whitespace_inside(el.name)
 
 
 def should_remove_whitespace_outside(el):
     """Return to remove whitespace immediately outside a block-level element."""
-    return should_remove_whitespace_inside(el) or (el and el.name == 'pre')
+    if not el or not el.name:
+        return False
+    return el.name == 'pre' or _removes_whitespace_inside(el.name)
 
 
 def _is_block_content_element(el):
@@ -133,6 +359,38 @@ def _is_block_content_element(el):
         return False
 
 
+def _can_ignore_child(el, should_remove_inside):
+    """
+    Return whether the child el of a tag is not converted: comments, doctypes
+    and whitespace-only text adjacent to the inner/outer boundaries of block
+    elements. should_remove_inside is should_remove_whitespace_inside() of
+    the tag.
+    """
+    if isinstance(el, Tag):
+        # Tags are always processed.
+        return False
+    elif isinstance(el, (Comment, Doctype)):
+        # Comment and Doctype elements are always ignored.
+        # (subclasses of NavigableString, must test first)
+        return True
+    elif isinstance(el, NavigableString):
+        if str(el).strip() != '':
+            # Non-whitespace text nodes are always processed.
+            return False
+        elif should_remove_inside and (not el.previous_sibling or not el.next_sibling):
+            # Inside block elements (excluding <pre>), ignore adjacent whitespace elements.
+            return True
+        elif should_remove_whitespace_outside(el.previous_sibling) or should_remove_whitespace_outside(el.next_sibling):
+            # Outside block elements (including <pre>), ignore adjacent whitespace elements.
+            return True
+        else:
+            return False
+    elif el is None:
+        return True
+    else:
+        raise ValueError('Unexpected element type: %s' % type(el))
+
+
 def _prev_block_content_sibling(el):
     """Returns the first previous sibling that is a content element, else None."""
     while el is not None:
@@ -151,6 +409,274 @@ def _next_block_content_sibling(el):
     return None
 
 
+def _os_file(f):
+    """
+    Return whether f is a file object reading the bytes of an operating system
+    file, as opened by open(path, 'rb'), rather than a wrapper such as a gzip,
+    bz2 or lzma file, whose fileno() is that of the compressed file.
+    """
+    if isinstance(f, io.BufferedReader):
+        f = f.raw
+    return isinstance(f, io.FileIO)
+
+
+def _mmap_file(f):
+    """
+    Return a read-only memory map of the binary file object f, or None if f
+    is not a regular file opened by open(path, 'rb') and read from its start,
+    or is empty.
+    """
+    if not _os_file(f):
+        return None
+    try:
+        fileno = f.fileno()
+        position = f.tell()
+        size = os.fstat(fileno).st_size
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        return None
+    if position != 0 or size == 0 or not stat.S_ISREG(os.fstat(fileno).st_mode):
+        return None
+    return mmap.mmap(fileno, 0, access=mmap.ACCESS_READ)
+
+
+def _etree_local_name(tag):
+    """Return an ElementTree tag name without its '{namespace}' prefix."""
+    return tag.rsplit('}', 1)[-1]
+
+
+def soup_from_etree(root):
+    """
+    Build a BeautifulSoup object from an ElementTree-style tree, such as one
+    returned by lxml.html or xml.etree.ElementTree, without serializing and
+    re-parsing the markup. Comments and processing instructions are dropped.
+    """
+    if hasattr(root, 'getroot'):
+        root = root.getroot()
+
+    _import_bs4()
+    soup = BeautifulSoup('', 'html.parser')
+    # Feed parser events to the soup directly, walking the tree with an
+    # explicit stack so that deeply nested trees are supported.
+    stack = [(False, root)]
+    while stack:
+        closing, el = stack.pop()
+        if closing or not isinstance(el.tag, str):
+            if closing:
+                soup.handle_endtag(_etree_local_name(el.tag))
+            if el.tail and el is not root:
+                soup.handle_data(el.tail)
+            continue
+        soup.handle_starttag(_etree_local_name(el.tag), None, None, dict(el.attrib))
+        if el.text:
+            soup.handle_data(el.text)
+        stack.append((True, el))
+        stack.extend((False, child) for child in reversed(list(el)))
+    soup.endData()
+    return soup
+
+
+def _collapse_newlines(child_strings):
+    """
+    Collapse newlines at the boundaries of converted child strings, yielding
+    the resulting pieces: where one child ends and the next starts with
+    newlines, only the larger number of them is kept, limited to 2.
+    """
+    prev_trailing_nl = ''
+    for child_string in child_strings:
+        if not child_string:
+            continue
+
+        # Separate the leading/trailing newlines from the content.
+        leading_nl, content, trailing_nl = re_extract_newlines.match(child_string).groups()
+
+        # If the last child had trailing newlines and this child has leading newlines,
+        # use the larger newline count, limited to 2.
+        if prev_trailing_nl and leading_nl:
+            num_newlines = min(2, max(len(prev_trailing_nl), len(leading_nl)))
+            leading_nl = '\n' * num_newlines
+        else:
+            yield prev_trailing_nl
+
+        yield leading_nl + content
+        prev_trailing_nl = trailing_nl
+    yield prev_trailing_nl
+
+
+def _strip_newlines(pieces, lstrip, rstrip):
+    """
+    Yield the non-empty pieces of a text, removing its leading and/or trailing
+    newlines, without joining the pieces.
+    """
+    held_nl = ''  # trailing newlines that may end the text
+    for piece in pieces:
+        if lstrip:
+            piece = piece.lstrip('\n')
+            lstrip = not piece
+        if rstrip:
+            content = piece.rstrip('\n')
+            if not content:
+                held_nl += piece
+                continue
+            piece, held_nl = held_nl + content, piece[len(content):]
+        if piece:
+            yield piece
+
+
+def _write_pieces(pieces, sink, encoding='utf-8'):
+    """
+    Write the pieces of a text to sink as they are yielded. A binary sink,
+    such as a file opened in 'wb' mode or a gzip.GzipFile, gets the pieces
+    encoded with encoding; a text sink gets them as they are.
+    """
+    if isinstance(sink, io.TextIOBase):
+        for piece in pieces:
+            sink.write(piece)
+        return
+    # (an incremental encoder writes a byte order mark once, at the start)
+    encoder = codecs.getincrementalencoder(encoding)()
+    for piece in pieces:
+        sink.write(encoder.encode(piece))
+    sink.write(encoder.encode('', True))
+
+
+class _ParentTags(set):
+    """
+    The parent context passed to the children of a tag: the set of the parent
+    tag names and pseudo-tags, plus state tracked by process_tag() so that
+    the conversion need not search the siblings and ancestors of an element.
+
+    - node: the tag whose children have this context
+    - parent: the context of the tag itself, if it was tracked
+    - names: the frozenset of the names the set is created with, shared by
+      all the contexts with the same names, from which the contexts of the
+      children are derived
+    - pre, inline, noformat: whether 'pre', '_inline' and '_noformat' are
+      among the names
+    - in_pre: whether node is, or is inside, a <pre> element of the document
+    - ul_depth: the number of <ul> elements among the parent tags
+    - tags_entered: the number of child tags entered so far
+    - list_items: the number of <li> child tags entered so far
+    - interned: the names interned for the conversion, shared by all the
+      contexts below the top-level element
+    - memo: the _SubtreeMemo of the conversion, or None
+    """
+    __slots__ = ('node', 'parent', 'names', 'pre', 'inline', 'noformat',
+                 'in_pre', 'ul_depth', 'tags_entered', 'list_items',
+                 'interned', 'memo', '_counts')
+
+    def __init__(self, parent_tags, node, names, ul_depth, interned, memo=None):
+        set.__init__(self, names)
+        self.node = node
+        self.parent = parent_tags if isinstance(parent_tags, _ParentTags) else None
+        self.names = names
+        self.pre = 'pre' in names
+        self.inline = '_inline' in names
+        self.noformat = '_noformat' in names
+        if node.name == 'pre':
+            self.in_pre = True
+        elif self.parent is not None:
+            self.in_pre = self.parent.in_pre
+        else:
+            self.in_pre = node.find_parent('pre') is not None
+        self.ul_depth = ul_depth
+        self.tags_entered = 0
+        self.list_items = 0
+        self.interned = interned
+        self.memo = memo
+        self._counts = None
+
+    def count(self, name):
+        """Return the number of descendants of node named name, computed once."""
+        if self._counts is None:
+            self._counts = {}
+        if name not in self._counts:
+            self._counts[name] = len(self.node.find_all(name))
+        return self._counts[name]
+
+
+# Tags whose conversion depends on their position among their siblings,
+# which are never memoized by the memoize_subtrees option
+_positional_tags = frozenset(['li', 'ol', 'ul', 'tr', 'thead', 'tbody', 'tfoot'])
+
+
+def _number_subtrees(root, number):
+    """
+    Return the id() of each tag below and including root mapped to a number
+    identifying its subtree, as returned by number() for the structure of
+    the tag: its name, attributes and the numbers of its child tags or the
+    type and text of its other children.
+    """
+    # Number the subtrees bottom-up, so that the number of a tag depends
+    # on the numbers of its children rather than on whole subtrees.
+    ids = {}
+    stack = [(root, False)]
+    while stack:
+        node, children_done = stack.pop()
+        if not children_done:
+            stack.append((node, True))
+            stack.extend((child, False) for child in node.contents if isinstance(child, Tag))
+            continue
+        structure = (
+            node.name,
+            tuple((name, tuple(value) if isinstance(value, list) else value)
+                  for name, value in node.attrs.items()),
+            tuple(ids[id(child)] if isinstance(child, Tag) else (type(child), str(child))
+                  for child in node.contents))
+        ids[id(node)] = number(structure)
+    return ids
+
+
+class _SubtreeMemo(object):
+    """
+    The converted subtrees of one conversion with the memoize_subtrees
+    option: structurally identical subtrees converted in the same parent
+    context share one result.
+
+    - ids: the id() of each tag mapped to a number shared by the tags with
+      identical subtrees, only for subtrees repeated in the document
+    - results: the converted subtrees, by key()
+    """
+    __slots__ = ('ids', 'results')
+
+    def __init__(self, root):
+        numbers = {}
+        ids = _number_subtrees(root, lambda structure: numbers.setdefault(structure, len(numbers)))
+        counts = {}
+        for number in ids.values():
+            counts[number] = counts.get(number, 0) + 1
+        self.ids = dict((key, number) for key, number in ids.items() if counts[number] > 1)
+        self.results = {}
+
+    def key(self, node, parent_tags):
+        """
+        Return the key of the result of node converted in parent_tags, or
+        None if it is not to be memoized.
+        """
+        number = self.ids.get(id(node))
+        if number is None or node.name in _positional_tags:
+            return None
+        return (number, parent_tags.names, parent_tags.ul_depth,
+                parent_tags.in_pre, node.parent.name)
+
+
+class _TagFrame(object):
+    """
+    Traversal state for one tag during MarkdownConverter.process_tag():
+    the children still to convert and the strings converted so far.
+    """
+    __slots__ = ('node', 'parent_tags', 'parent_tags_for_children',
+                 'children', 'index', 'child_strings', 'memo_key')
+
+    def __init__(self, converter, node, parent_tags):
+        self.node = node
+        self.parent_tags = parent_tags
+        self.parent_tags_for_children = converter._parent_tags_for_children(node, parent_tags)
+        self.children = converter._collect_children(node)
+        self.index = 0
+        self.child_strings = []
+        self.memo_key = None
+
+
 class MarkdownConverter(object):
     class DefaultOptions:
         autolinks = True
@@ -164,7 +690,10 @@ class MarkdownConverter(object):
         escape_misc = False
         heading_style = UNDERLINED
         keep_inline_images_in = []
+        memoize_subtrees = False
         newline_style = SPACES
+        parser = 'html.parser'
+        profile = False
         strip = None
         strip_document = STRIP
         strong_em_symbol = ASTERISK
@@ -180,23 +709,142 @@ class MarkdownConverter(object):
     def __init__(self, **options):
         # Create an options dictionary. Use DefaultOptions as a base so that
         # it doesn't have to be extended.
-        self.options = _todict(self.DefaultOptions)
-        self.options.update(_todict(self.Options))
-        self.options.update(options)
-        if self.options['strip'] is not None and self.options['convert'] is not None:
+        options = dict(_class_options(type(self)), **options)
+        if options['strip'] is not None and options['convert'] is not None:
             raise ValueError('You may specify either tags to strip or tags to'
                              ' convert, but not both.')
+        _import_bs4()
+
+        # The options are read-only after construction, so that a converter
+        # may be shared between threads: all the state of a conversion is
+        # held by the call, apart from the conversion function cache, which
+        # only ever gains identical entries.
+        self.options = MappingProxyType(options)
 
         # Initialize the conversion function cache
         self.convert_fn_cache = {}
 
+        # Select the escaping for the escape options
+        if self.options['escape_misc']:
+            self._escape_misc = _compile_escape_misc(self.options['escape_asterisks'],
+                                                     self.options['escape_underscores'])
+        else:
+            self._escape_misc = None
+
+        # Collect profiling statistics, if enabled.
+        self.stats = None
+        if self.options['profile']:
+            from markdownify.stats import ConversionStats
+            self.stats = ConversionStats()
+            self.stats.instrument(self)
+
+    def __getstate__(self):
+        # The options proxy cannot be pickled, nor can the cached heading
+        # conversion functions and the methods timed for profiling.
+        state = dict(self.__dict__, options=dict(self.options), convert_fn_cache={})
+        if self.stats is not None:
+            from markdownify.stats import INSTRUMENTED
+            for name in INSTRUMENTED:
+                del state[name]
+        return state
+
+    def __setstate__(self, state):
+        _import_bs4()
+        self.__dict__.update(state, options=MappingProxyType(state['options']))
+        if self.stats is not None:
+            self.stats.instrument(self)
+
     def convert(self, html):
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = self._parse(html)
         return self.convert_soup(soup)
 
+    def _parse(self, html):
+        """
+        Parse html into a BeautifulSoup object using the configured parser.
+        html is text, bytes, a memory-mapped file or a file object.
+        """
+        if hasattr(html, 'read') and not isinstance(html, mmap.mmap):
+            # Map binary files into memory rather than reading them whole.
+            mapped = _mmap_file(html)
+            if mapped is None:
+                return self._parse_markup(html.read())
+            with mapped:
+                return self._parse_markup(mapped)
+        return self._parse_markup(html)
+
+    def _parse_markup(self, html):
+        """Parse html, given as text or bytes, for _parse()."""
+        parser = self.options['parser']
+        if not isinstance(html, str) and parser == 'html.parser':
+            # Decode the bytes as they are parsed, without a copy of the text.
+            from markdownify.stream import parse_bytes
+            return parse_bytes(html)
+        if isinstance(html, (mmap.mmap, memoryview, bytearray)):
+            html = bytes(html)
+        if not callable(parser):
+            # A BeautifulSoup tree builder feature such as 'lxml' or 'html5lib'
+            return BeautifulSoup(html, parser)
+
+        # A custom parser may return a BeautifulSoup object or an ElementTree
+        # (e.g. lxml) tree, which is translated without re-parsing.
+        tree = parser(html)
+        if not isinstance(tree, Tag):
+            tree = soup_from_etree(tree)
+        return tree
+
     def convert_soup(self, soup):
         return self.process_tag(soup, parent_tags=set())
 
+    def iter_convert(self, html):
+        """
+        Convert html, yielding the Markdown in pieces as each block is
+        converted. Joined, the pieces equal convert(html).
+        """
+        if type(self).convert is not MarkdownConverter.convert:
+            # A subclass converting documents its own way converts them whole.
+            return iter([self.convert(html)])
+        return self.iter_convert_soup(self._parse(html))
+
+    def convert_to(self, html, sink, encoding='utf-8'):
+        """
+        Convert html, writing the Markdown to sink as each block is converted
+        instead of returning it. A binary sink, such as a file
+        opened in 'wb' mode or a gzip.GzipFile, gets the Markdown encoded with
+        encoding; a text sink gets it as is.
+        """
+        _write_pieces(self.iter_convert(html), sink, encoding)
+
+    def iter_convert_soup(self, soup):
+        """
+        Convert a BeautifulSoup object, yielding the Markdown in pieces as each
+        block is converted. Joined, the pieces equal convert_soup(soup).
+        """
+        convert_fn = self.get_conv_fn_cached(soup.name)
+        # (unwrapping the conversion functions timed with the profile option)
+        if soup.name != '[document]' or self._overrides_processing() or (
+                type(self).convert_soup is not MarkdownConverter.convert_soup) or (
+                convert_fn is not None
+                and getattr(getattr(convert_fn, '__wrapped__', convert_fn), '__func__', None)
+                is not MarkdownConverter.convert__document_):
+            # The conversion function, or the subclass, needs the converted
+            # text as a whole.
+            yield self.convert_soup(soup)
+            return
+
+        # Apply the document-level formatting of convert__document_() to the pieces.
+        strip_document = self.options['strip_document'] if convert_fn is not None else None
+        if strip_document not in (LSTRIP, RSTRIP, STRIP, None):
+            raise ValueError('Invalid value for strip_document: %s' % strip_document)
+
+        # Convert the blocks of the document one at a time, descending into
+        # the tags that only join or separate their children, as
+        # iter_convert_chunks() does while the document is parsed.
+        from markdownify.stream import iter_convert_soup
+        for piece in _strip_newlines(iter_convert_soup(self, soup),
+                                     lstrip=strip_document in (LSTRIP, STRIP),
+                                     rstrip=strip_document in (RSTRIP, STRIP)):
+            yield piece
+
     def process_element(self, node, parent_tags=None):
         if isinstance(node, NavigableString):
             return self.process_text(node, parent_tags=parent_tags)
@@ -208,92 +856,125 @@ class MarkdownConverter(object):
         if parent_tags is None:
             parent_tags = set()
 
-        # Collect child elements to process, ignoring whitespace-only text elements
-        # adjacent to the inner/outer boundaries of block elements.
-        should_remove_inside = should_remove_whitespace_inside(node)
-
-        def _can_ignore(el):
-            if isinstance(el, Tag):
-                # Tags are always processed.
-                return False
-            elif isinstance(el, (Comment, Doctype)):
-                # Comment and Doctype elements are always ignored.
-                # (subclasses of NavigableString, must test first)
-                return True
-            elif isinstance(el, NavigableString):
-                if six.text_type(el).strip() != '':
-                    # Non-whitespace text nodes are always processed.
-                    return False
-                elif should_remove_inside and (not el.previous_sibling or not el.next_sibling):
-                    # Inside block elements (excluding <pre>), ignore adjacent whitespace elements.
-                    return True
-                elif should_remove_whitespace_outside(el.previous_sibling) or should_remove_whitespace_outside(el.next_sibling):
-                    # Outside block elements (including <pre>), ignore adjacent whitespace elements.
-                    return True
+        frame = _TagFrame(self, node, parent_tags)
+        frame.child_strings.extend(self._iter_child_strings(frame))
+        return self._finish_tag(frame)
+
+    def _iter_child_strings(self, top):
+        """Convert the children of a tag frame, yielding one string per child."""
+        # Walk the subtree with an explicit stack of frames instead of recursing
+        # through process_element(), so that deeply nested documents are limited
+        # by available memory rather than by the interpreter's recursion limit.
+        # Subclasses that override process_element() or process_tag() still have
+        # their override called for every child tag.
+        delegate = self._overrides_processing()
+        stack = [top]
+        while stack:
+            frame = stack[-1]
+            if frame.index < len(frame.children):
+                el = frame.children[frame.index]
+                frame.index += 1
+                if isinstance(el, Tag):
+                    frame.parent_tags_for_children.tags_entered += 1
+                    if el.name == 'li':
+                        frame.parent_tags_for_children.list_items += 1
+                if isinstance(el, NavigableString):
+                    text = self.process_text(el, parent_tags=frame.parent_tags_for_children)
+                elif delegate:
+                    text = self.process_element(el, parent_tags=frame.parent_tags_for_children)
                 else:
-                    return False
-            elif el is None:
-                return True
+                    # Reuse the result of an identical subtree, if memoized.
+                    memo = frame.parent_tags_for_children.memo
+                    memo_key = None
+                    if memo is not None:
+                        memo_key = memo.key(el, frame.parent_tags_for_children)
+                    if memo_key is not None and memo_key in memo.results:
+                        text = memo.results[memo_key]
+                    else:
+                        child = _TagFrame(self, el, frame.parent_tags_for_children)
+                        child.memo_key = memo_key
+                        stack.append(child)
+                        continue
             else:
-                raise ValueError('Unexpected element type: %s' % type(el))
-
-        children_to_convert = [el for el in node.children if not _can_ignore(el)]
-
-        # Create a copy of this tag's parent context, then update it to include this tag
-        # to propagate down into the children.
-        parent_tags_for_children = set(parent_tags)
-        parent_tags_for_children.add(node.name)
-
-        # if this tag is a heading or table cell, add an '_inline' parent pseudo-tag
-        if (
-            re_html_heading.match(node.name) is not None  # headings
-            or node.name in {'td', 'th'}  # table cells
-        ):
-            parent_tags_for_children.add('_inline')
-
-        # if this tag is a preformatted element, add a '_noformat' parent pseudo-tag
-        if node.name in {'pre', 'code', 'kbd', 'samp'}:
-            parent_tags_for_children.add('_noformat')
-
-        # Convert the children elements into a list of result strings.
-        child_strings = [
-            self.process_element(el, parent_tags=parent_tags_for_children)
-            for el in children_to_convert
-        ]
+                # All children are converted; finish this tag and hand the
+                # result to the parent frame.
+                stack.pop()
+                if frame is top:
+                    return
+                text = self._finish_tag(frame)
+                if frame.memo_key is not None:
+                    frame.parent_tags.memo.results[frame.memo_key] = text
+                frame = stack[-1]
+
+            if frame is top:
+                yield text
+            else:
+                frame.child_strings.append(text)
 
-        # Remove empty string values.
-        child_strings = [s for s in child_strings if s]
+    def _overrides_processing(self):
+        """Return whether a subclass overrides process_element() or process_tag()."""
+        cls = type(self)
+        return (cls.process_element is not MarkdownConverter.process_element
+                or cls.process_tag is not MarkdownConverter.process_tag)
 
-        # Collapse newlines at child element boundaries, if needed.
-        if node.name == 'pre' or node.find_parent('pre'):
-            # Inside <pre> blocks, do not collapse newlines.
-            pass
+    def _collect_children(self, node):
+        """Return the children of node that are to be converted."""
+        should_remove_inside = should_remove_whitespace_inside(node)
+        return [el for el in node.children if not _can_ignore_child(el, should_remove_inside)]
+
+    def _parent_tags_for_children(self, node, parent_tags):
+        """Return the parent context to propagate into the children of node."""
+        if isinstance(parent_tags, _ParentTags):
+            parent_names = parent_tags.names
+            ul_depth = parent_tags.ul_depth
+            interned = parent_tags.interned
+            memo = parent_tags.memo
         else:
-            # Collapse newlines at child element boundaries.
-            updated_child_strings = ['']  # so the first lookback works
-            for child_string in child_strings:
-                # Separate the leading/trailing newlines from the content.
-                leading_nl, content, trailing_nl = re_extract_newlines.match(child_string).groups()
-
-                # If the last child had trailing newlines and this child has leading newlines,
-                # use the larger newline count, limited to 2.
-                if updated_child_strings[-1] and leading_nl:
-                    prev_trailing_nl = updated_child_strings.pop()  # will be replaced by the collapsed value
-                    num_newlines = min(2, max(len(prev_trailing_nl), len(leading_nl)))
-                    leading_nl = '\n' * num_newlines
-
-                # Add the results to the updated child string list.
-                updated_child_strings.extend([leading_nl, content, trailing_nl])
-
-            child_strings = updated_child_strings
-
-        # Join all child text strings into a single string.
-        text = ''.join(child_strings)
+            # For the top-level element, count the <ul> elements in the
+            # parent context from the document.
+            parent_names = frozenset(parent_tags)
+            ul_depth = sum(1 for parent in node.parents if parent.name == 'ul')
+            interned = {}
+            memo = None
+            if self.options['memoize_subtrees'] and not self._overrides_processing():
+                memo = _SubtreeMemo(node)
+        if node.name == 'ul':
+            ul_depth += 1
+
+        # Add this tag, and any parent pseudo-tags it implies, to its parent
+        # names to propagate down into the children. The result is interned,
+        # so that every tag with the same parent names and tag name shares
+        # one frozenset.
+        key = (parent_names, node.name)
+        names = interned.get(key)
+        if names is None:
+            added = {node.name}
+
+            # if this tag is a heading or table cell, add an '_inline' parent pseudo-tag
+            if (
+                re_html_heading.match(node.name) is not None  # headings
+                or node.name in {'td', 'th'}  # table cells
+            ):
+                added.add('_inline')
+
+            # if this tag is a preformatted element, add a '_noformat' parent pseudo-tag
+            if node.name in {'pre', 'code', 'kbd', 'samp'}:
+                added.add('_noformat')
+
+            names = parent_names if added <= parent_names else parent_names | added
+            names = interned[key] = interned.setdefault(names, names)
+
+        return _ParentTags(parent_tags, node, names, ul_depth, interned, memo)
+
+    def _finish_tag(self, frame):
+        """Join the converted children of a tag and apply its conversion function."""
+        node = frame.node
+        text = self._join_child_strings(frame)
 
         # apply this tag's final conversion function
         convert_fn = self.get_conv_fn_cached(node.name)
         if convert_fn is not None:
-            text = convert_fn(node, text, parent_tags=parent_tags)
+            text = convert_fn(node, text, parent_tags=frame.parent_tags)
 
         return text
 
@@ -317,10 +998,17 @@ class MarkdownConverter(object):
         if parent_tags is None:
             parent_tags = set()
 
-        text = six.text_type(el) or ''
+        text = str(el) or ''
+
+        if isinstance(parent_tags, _ParentTags):
+            pre, noformat = parent_tags.pre, parent_tags.noformat
+        else:
+            pre, noformat = 'pre' in parent_tags, '_noformat' in parent_tags
 
-        # normalize whitespace if we're not inside a preformatted element
-        if 'pre' not in parent_tags:
+        # normalize whitespace if we're not inside a preformatted element,
+        # unless the text is already normalized: without tabs, line breaks or
+        # runs of spaces, as most text is
+        if not pre and ('  ' in text or '\n' in text or '\t' in text or '\r' in text):
             if self.options['wrap']:
                 text = re_all_whitespace.sub(' ', text)
             else:
@@ -328,7 +1016,7 @@ class MarkdownConverter(object):
                 text = re_whitespace.sub(' ', text)
 
         # escape special characters if we're not inside a preformatted or code element
-        if '_noformat' not in parent_tags:
+        if not noformat:
             text = self.escape(text, parent_tags)
 
         # remove leading whitespace at the start or just after a
@@ -345,6 +1033,14 @@ class MarkdownConverter(object):
 
         return text
 
+    def _join_child_strings(self, frame):
+        """Join the converted children of a tag into a single string."""
+        # Collapse newlines at child element boundaries, if needed.
+        if frame.parent_tags_for_children.in_pre:
+            # Inside <pre> blocks, do not collapse newlines.
+            return ''.join(frame.child_strings)
+        return ''.join(_collapse_newlines(frame.child_strings))
+
     def get_conv_fn_cached(self, tag_name):
         """Given a tag name, return the conversion function using the cache."""
         # If conversion function is not in cache, add it
@@ -356,20 +1052,17 @@ class MarkdownConverter(object):
 
     def get_conv_fn(self, tag_name):
         """Given a tag name, find and return the conversion function."""
-        tag_name = tag_name.lower()
+        tag_name, n, convert_fn_name = _conv_fn_dispatch(tag_name)
 
         # Handle strip/convert exclusion options
         if not self.should_convert_tag(tag_name):
             return None
 
         # Handle headings with _convert_hn() function
-        match = re_html_heading.match(tag_name)
-        if match:
-            n = int(match.group(1))
+        if n is not None:
             return lambda el, text, parent_tags: self._convert_hn(n, el, text, parent_tags)
 
         # For other tags, look up their conversion function by tag name
-        convert_fn_name = "convert_%s" % re_make_convert_fn_name.sub('_', tag_name)
         convert_fn = getattr(self, convert_fn_name, None)
         return convert_fn
 
@@ -387,11 +1080,9 @@ class MarkdownConverter(object):
     def escape(self, text, parent_tags):
         if not text:
             return ''
-        if self.options['escape_misc']:
-            text = re_escape_misc_chars.sub(r'\\\1', text)
-            text = re_escape_misc_dash_sequences.sub(r'\1\\\2', text)
-            text = re_escape_misc_hashes.sub(r'\1\\\2', text)
-            text = re_escape_misc_list_items.sub(r'\1\\\2', text)
+        if self._escape_misc is not None:
+            # All enabled escapes in a single pass
+            return self._escape_misc(text)
 
         if self.options['escape_asterisks']:
             text = text.replace('*', r'\*')
@@ -592,13 +1283,16 @@ class MarkdownConverter(object):
                 start = int(parent.get("start"))
             else:
                 start = 1
-            bullet = '%s.' % (start + len(el.find_previous_siblings('li')))
+            # process_tag() counts the list items entered so far, including this one
+            index = getattr(parent_tags, 'list_items', 0) - 1
+            if index < 0:
+                index = len(el.find_previous_siblings('li'))
+            bullet = '%s.' % (start + index)
         else:
-            depth = -1
-            while el:
-                if el.name == 'ul':
-                    depth += 1
-                el = el.parent
+            depth = getattr(parent_tags, 'ul_depth', None)
+            if depth is None:
+                depth = sum(1 for parent in el.parents if parent.name == 'ul')
+            depth -= 1
             bullets = self.options['bullets']
             bullet = bullets[depth % len(bullets)]
         bullet = bullet + ' '
@@ -631,10 +1325,7 @@ class MarkdownConverter(object):
                     line = line.lstrip(' \t\r\n')
                     line_no_trailing = line.rstrip()
                     trailing = line[len(line_no_trailing):]
-                    line = fill(line,
-                                width=self.options['wrap_width'],
-                                break_long_words=False,
-                                break_on_hyphens=False)
+                    line = _fill(line, self.options['wrap_width'])
                     new_lines.append(line + trailing)
                 text = '\n'.join(new_lines)
         return '\n\n%s\n\n' % text if text else ''
@@ -687,17 +1378,29 @@ class MarkdownConverter(object):
         return ' ' + text.strip().replace("\n", " ") + ' |' * colspan
 
     def convert_tr(self, el, text, parent_tags):
+        # Use the row and section state tracked by process_tag(), if available,
+        # so that converting a row does not search the whole table.
+        section = parent_tags if isinstance(parent_tags, _ParentTags) else None
+        table = section.parent if section is not None else None
+
         cells = el.find_all(['td', 'th'])
-        is_first_row = el.find_previous_sibling() is None
+        if section is not None:
+            # process_tag() counts the tags entered so far, including this row
+            is_first_row = section.tags_entered == 1
+        else:
+            is_first_row = el.find_previous_sibling() is None
         is_headrow = (
             all([cell.name == 'th' for cell in cells])
             or (el.parent.name == 'thead'
                 # avoid multiple tr in thead
-                and len(el.parent.find_all('tr')) == 1)
+                and (section.count('tr') if section is not None
+                     else len(el.parent.find_all('tr'))) == 1)
         )
         is_head_row_missing = (
             (is_first_row and not el.parent.name == 'tbody')
-            or (is_first_row and el.parent.name == 'tbody' and len(el.parent.parent.find_all(['thead'])) < 1)
+            or (is_first_row and el.parent.name == 'tbody'
+                and (table.count('thead') if table is not None
+                     else len(el.parent.parent.find_all(['thead']))) < 1)
         )
         overline = ''
         underline = ''
@@ -721,7 +1424,8 @@ class MarkdownConverter(object):
               or (is_first_row
                   and (el.parent.name == 'table'
                        or (el.parent.name == 'tbody'
-                           and not el.parent.find_previous_sibling())))):
+                           and (table.tags_entered == 1 if table is not None
+                                else not el.parent.find_previous_sibling()))))):
             # headline is missing and header inference is disabled or:
             # first row, not headline, and:
             #  - the parent is table or
@@ -734,3 +1438,7 @@ class MarkdownConverter(object):
 
 def markdownify(html, **options):
     return MarkdownConverter(**options).convert(html)
+
+
+def convert_to(html, sink, encoding='utf-8', **options):
+    MarkdownConverter(**options).convert_to(html, sink, encoding)
@@ -0,0 +1,142 @@
+"""
+Convert HTML documents from asyncio code, in an executor.
+
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import os
+import threading
+
+from markdownify import MarkdownConverter, _os_file
+
+
+def _size(html):
+    """
+    Return the length of html, or the size of the rest of a file, or None if
+    html is another file object, such as a compressed file, of unknown size.
+    """
+    if hasattr(html, 'read'):
+        if not _os_file(html):
+            return None
+        try:
+            return os.fstat(html.fileno()).st_size - html.tell()
+        except (AttributeError, OSError, ValueError):
+            return None
+    return len(html)
+
+
+def _check_size(html, max_size):
+    if max_size is None:
+        return
+    size = _size(html)
+    if size is not None and size > max_size:
+        raise ValueError('The document length %d exceeds max_size %d.'
+                         % (size, max_size))
+
+
+async def aconvert(html, executor=None, timeout=None, max_size=None,
+                   converter_class=MarkdownConverter, **options):
+    """
+    Convert html with a converter_class instance created with the given
+    options, in executor rather than in the event loop, and return the
+    Markdown. executor defaults to the default executor of the loop.
+
+    A ValueError is raised without converting the document if it is longer
+    than max_size, and an asyncio.TimeoutError if it takes longer than
+    timeout seconds. To limit the number of concurrent conversions, use an
+    AsyncConverter.
+    """
+    _check_size(html, max_size)
+    converter = converter_class(**options)
+    loop = asyncio.get_running_loop()
+    return await asyncio.wait_for(
+        loop.run_in_executor(executor, converter.convert, html), timeout)
+
+
+class AsyncConverter(object):
+    """
+    Convert HTML documents from asyncio code with one converter_class
+    instance, created with the given options, in executor rather than in the
+    event loop.
+
+    At most limit conversions run at once, by default the number of CPUs;
+    further calls of convert() wait for a conversion to finish, so that
+    documents are not queued in the executor faster than they are converted.
+    A conversion that is not finished after timeout seconds is cancelled,
+    and one of a document longer than max_size is refused.
+
+    executor defaults to a thread pool of limit threads, which close() shuts
+    down; the converter is shared by the threads. With a ProcessPoolExecutor,
+    the converter is sent to the worker process with each document, so it
+    must be picklable.
+    """
+
+    def __init__(self, executor=None, limit=None, timeout=None, max_size=None,
+                 converter_class=MarkdownConverter, **options):
+        self.converter = converter_class(**options)
+        self.limit = limit or os.cpu_count() or 1
+        self.timeout = timeout
+        self.max_size = max_size
+        self._own_executor = executor is None
+        self.executor = ThreadPoolExecutor(self.limit) if executor is None else executor
+        # The semaphore is created in the loop running the conversions (before
+        # Python 3.10, it binds to the loop current when it is created).
+        self._loop = self._semaphore = None
+        # The futures not done yet, cancelled by close()
+        self._futures = set()
+        self._lock = threading.Lock()
+
+    async def convert(self, html):
+        """
+        Convert html and return the Markdown, the same as the convert() method
+        of the converter.
+
+        Raises a ValueError if html is longer than max_size, and an
+        asyncio.TimeoutError if the conversion takes longer than timeout
+        seconds. The conversion keeps its place in the limit until it is
+        finished, even if it timed out: a conversion already running in a
+        thread cannot be interrupted.
+        """
+        _check_size(html, self.max_size)
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop, self._semaphore = loop, asyncio.Semaphore(self.limit)
+        semaphore = self._semaphore
+        await semaphore.acquire()
+        try:
+            future = self.executor.submit(self.converter.convert, html)
+        except BaseException:
+            semaphore.release()
+            raise
+        with self._lock:
+            self._futures.add(future)
+        future.add_done_callback(lambda f: self._release(f, loop, semaphore))
+        return await asyncio.wait_for(asyncio.wrap_future(future, loop=loop), self.timeout)
+
+    def _release(self, future, loop, semaphore):
+        # Called in the executor thread when the conversion is finished.
+        with self._lock:
+            self._futures.discard(future)
+        try:
+            loop.call_soon_threadsafe(semaphore.release)
+        except RuntimeError:
+            pass  # the loop is closed
+
+    def close(self):
+        """
+        Shut down the executor, if it was created by this AsyncConverter,
+        cancelling the conversions that have not started.
+        """
+        if self._own_executor:
+            # (as shutdown(cancel_futures=True), which needs Python 3.9)
+            with self._lock:
+                futures = list(self._futures)
+            for future in futures:
+                future.cancel()
+            self.executor.shutdown(wait=False)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.close()
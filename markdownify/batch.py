@@ -0,0 +1,139 @@
+"""
+Convert many HTML documents, in parallel worker processes.
+
+"""
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+import os
+import pickle
+import traceback
+
+from markdownify import MarkdownConverter
+
+
+# The converter of a worker process, created once by _init_worker().
+_worker_converter = None
+
+
+class WorkerError(Exception):
+    """
+    The result of a document whose conversion in a worker process raised an
+    exception that cannot be sent back to the parent process, with the name
+    of its type, its message and its formatted traceback.
+    """
+
+    def __init__(self, type_name, message, traceback):
+        super().__init__(type_name, message, traceback)
+        self.type_name = type_name
+        self.message = message
+        self.traceback = traceback
+
+    def __str__(self):
+        return '%s: %s' % (self.type_name, self.message)
+
+
+def _picklable(e):
+    """Return the exception e, or a WorkerError describing it if it cannot be unpickled."""
+    try:
+        pickle.loads(pickle.dumps(e))
+    except Exception:
+        return WorkerError(type(e).__name__, str(e),
+                           ''.join(traceback.format_exception(type(e), e, e.__traceback__)))
+    return e
+
+
+def _init_worker(converter_class, options):
+    global _worker_converter
+    _worker_converter = converter_class(**options)
+
+
+def _convert_chunk(chunk, converter=None):
+    """
+    Convert a list of (index, html) pairs, returning (index, result) pairs.
+    The result is the Markdown, or the exception raised converting the html;
+    in a worker process, one that can be sent back to the parent process.
+    """
+    in_worker = converter is None
+    converter = converter or _worker_converter
+    results = []
+    for index, html in chunk:
+        try:
+            results.append((index, converter.convert(html)))
+        except Exception as e:
+            results.append((index, _picklable(e) if in_worker else e))
+    return results
+
+
+def _chunks(iterable, chunksize):
+    """Yield lists of up to chunksize (index, item) pairs from iterable."""
+    items = enumerate(iterable)
+    while True:
+        chunk = list(islice(items, chunksize))
+        if not chunk:
+            return
+        yield chunk
+
+
+def convert_many(htmls, workers=None, chunksize=32, ordered=True,
+                 converter_class=MarkdownConverter, **options):
+    """
+    Convert each HTML document of the iterable htmls, yielding (index, result)
+    pairs, where index is the position of the document in htmls and result
+    is its Markdown, or the exception raised converting it (a WorkerError if
+    the exception of a worker process cannot be pickled). A failed document
+    does not stop the conversion of the others.
+
+    The documents are converted in chunks of chunksize by a pool of worker
+    processes, each reusing one converter_class instance created with the
+    given options. workers defaults to the number of CPUs; if it is 1, the
+    documents are converted in the current process instead. Results are
+    yielded in the order of htmls, or as soon as they are available if
+    ordered is False.
+
+    The options, converter_class and the documents are sent to the worker
+    processes, so they must be picklable: callbacks such as
+    code_language_callback must be module-level functions.
+    """
+    # Create a converter up front, so that invalid options are reported here
+    # rather than by each worker process.
+    converter = converter_class(**options)
+    chunks = _chunks(htmls, chunksize)
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1:
+        for chunk in chunks:
+            for result in _convert_chunk(chunk, converter):
+                yield result
+        return
+
+    with ProcessPoolExecutor(workers, initializer=_init_worker,
+                             initargs=(converter_class, options)) as executor:
+        # Limit the chunks in flight, so that the documents are read from
+        # htmls as they are needed rather than all at once.
+        max_pending = 2 * workers
+
+        if ordered:
+            pending = deque()
+            for chunk in chunks:
+                pending.append(executor.submit(_convert_chunk, chunk))
+                if len(pending) >= max_pending:
+                    for result in pending.popleft().result():
+                        yield result
+            while pending:
+                for result in pending.popleft().result():
+                    yield result
+        else:
+            pending = set()
+            for chunk in chunks:
+                pending.add(executor.submit(_convert_chunk, chunk))
+                if len(pending) >= max_pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        for result in future.result():
+                            yield result
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    for result in future.result():
+                        yield result
@@ -0,0 +1,312 @@
+"""
+Cache conversion results, keyed by the HTML and the converter.
+
+"""
+from collections import OrderedDict, namedtuple
+import functools
+import hashlib
+import mmap
+import re
+import sqlite3
+import sys
+import threading
+import types
+
+
+CacheInfo = namedtuple('CacheInfo', 'hits store_hits misses maxsize currsize')
+
+
+def _code_digest(code, digest, seen=None):
+    """Update digest with code and the code objects among its constants."""
+    digest.update(code.co_code)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            _code_digest(const, digest, seen)
+        else:
+            _canonical(const, digest, seen)
+    digest.update(repr(code.co_names).encode('utf-8'))
+
+
+# The types of the constants of classes and modules in fingerprints. Other
+# values, such as dicts and bool flags, may be caches or state.
+_CONSTANT_TYPES = (str, bytes, int, float, complex, type(None), re.Pattern)
+
+
+def _is_definition(value):
+    """Return whether value is a function, class or constant, for _attributes_digest()."""
+    if isinstance(value, (tuple, frozenset)):
+        return all(_is_definition(item) for item in value)
+    return (isinstance(value, (types.FunctionType, functools.partial, type) + _CONSTANT_TYPES)
+            and not isinstance(value, bool))
+
+
+def _attributes_digest(namespace, digest, seen=None):
+    """
+    Update digest with the functions, methods, classes and constants in
+    namespace, the attributes of a class or module. Functions are digested
+    with the contents of their closure, such as the functions passed to
+    abstract_inline_conversion().
+    """
+    for name in sorted(namespace):
+        if name.startswith('__') and name.endswith('__'):
+            continue
+        value = namespace[name]
+        if isinstance(value, (staticmethod, classmethod)):
+            value = value.__func__
+        elif isinstance(value, property):
+            value = (value.fget, value.fset, value.fdel)
+        if _is_definition(value):
+            digest.update(name.encode('utf-8'))
+            _canonical(value, digest, seen)
+
+
+def _name(value):
+    return ('%s.%s' % (getattr(value, '__module__', ''),
+                       getattr(value, '__qualname__', ''))).encode('utf-8')
+
+
+def _canonical(value, digest, seen=None):
+    """
+    Update digest with a canonical representation of an option value.
+
+    Functions are represented by their name and code and by the values they
+    are called with: their default arguments and the contents of their
+    closure, the arguments of a functools.partial and the object of a bound
+    method. Raises TypeError for a value with no canonical representation,
+    such as an object without a repr() of its own.
+    """
+    if seen is None:
+        seen = set()
+    if isinstance(value, (set, frozenset)):
+        digest.update(b'set')
+        for item in sorted(value, key=repr):
+            _canonical(item, digest, seen)
+    elif isinstance(value, (list, tuple)):
+        digest.update(type(value).__name__.encode('utf-8'))
+        for item in value:
+            _canonical(item, digest, seen)
+    elif isinstance(value, dict):
+        digest.update(b'dict')
+        for key in sorted(value, key=repr):
+            _canonical(key, digest, seen)
+            _canonical(value[key], digest, seen)
+    elif isinstance(value, types.ModuleType):
+        digest.update(b'module ' + value.__name__.encode('utf-8'))
+    elif id(value) in seen:
+        # a function reached again through its own closure or arguments
+        digest.update(b'seen ' + _name(value))
+    elif isinstance(value, functools.partial):
+        seen.add(id(value))
+        digest.update(b'partial')
+        _canonical(value.func, digest, seen)
+        _canonical(value.args, digest, seen)
+        _canonical(value.keywords, digest, seen)
+    elif isinstance(value, types.FunctionType):
+        seen.add(id(value))
+        digest.update(_name(value))
+        _code_digest(value.__code__, digest, seen)
+        _canonical(value.__defaults__, digest, seen)
+        _canonical(value.__kwdefaults__, digest, seen)
+        for cell in value.__closure__ or ():
+            try:
+                contents = cell.cell_contents
+            except ValueError:
+                digest.update(b'empty cell')
+            else:
+                _canonical(contents, digest, seen)
+    elif isinstance(value, (types.MethodType, types.BuiltinMethodType)):
+        # (bound methods, and built-in functions, bound to their module)
+        seen.add(id(value))
+        digest.update(b'method')
+        _canonical(getattr(value, '__func__', None) or _name(value), digest, seen)
+        _canonical(value.__self__, digest, seen)
+    elif isinstance(value, re.Pattern):
+        # (the repr() of a long pattern is truncated)
+        digest.update(b'pattern %d ' % value.flags)
+        _canonical(value.pattern, digest, seen)
+    elif isinstance(value, type):
+        seen.add(id(value))
+        digest.update(b'class ' + _name(value))
+        _attributes_digest(vars(value), digest, seen)
+    elif callable(value) or type(value).__repr__ is object.__repr__:
+        raise TypeError('cannot fingerprint the option value %r' % (value,))
+    else:
+        digest.update(repr(value).encode('utf-8'))
+    digest.update(b'\0')
+
+
+_class_fingerprints = {}
+
+
+def _version(distribution):
+    """Return the installed version of distribution, or None."""
+    try:
+        from importlib.metadata import PackageNotFoundError, version
+    except ImportError:
+        return None
+    try:
+        return version(distribution)
+    except PackageNotFoundError:
+        return None
+
+
+def fingerprint(converter):
+    """
+    Return a fingerprint of converter: a digest of its options, of the code
+    and constants of its class, its base classes and their modules, and of
+    the versions of markdownify and beautifulsoup4, which changes when any of
+    them changes. Raises TypeError if an option value has no canonical
+    representation, as converters with such options cannot share cached
+    results.
+    """
+    cls = type(converter)
+    if cls not in _class_fingerprints:
+        import bs4
+
+        digest = hashlib.blake2b(digest_size=16)
+        _canonical((_version('markdownify'), bs4.__version__), digest)
+        modules = []
+        # (the classes reached again, as through the __class__ closure cell of
+        # the methods calling super(), are digested by name)
+        seen = set(map(id, cls.__mro__))
+        for base in cls.__mro__[:-1]:  # all but object
+            digest.update(('%s.%s' % (base.__module__, base.__qualname__)).encode('utf-8'))
+            _attributes_digest(vars(base), digest, seen)
+            if base.__module__ not in modules:
+                modules.append(base.__module__)
+        for module in modules:
+            # (the functions and classes imported from other modules are left
+            # to the fingerprint of their own module)
+            namespace = vars(sys.modules[module])
+            _attributes_digest(dict((name, value) for name, value in namespace.items()
+                                    if not isinstance(value, (types.FunctionType, type))
+                                    or value.__module__ == module),
+                               digest, seen)
+        _class_fingerprints[cls] = digest.hexdigest()
+
+    digest = hashlib.blake2b(_class_fingerprints[cls].encode('ascii'), digest_size=16)
+    _canonical(dict(converter.options), digest)
+    return digest.hexdigest()
+
+
+class SqliteStore(object):
+    """A store of cached results in the sqlite database file path."""
+
+    def __init__(self, path):
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS markdown'
+                ' (key TEXT PRIMARY KEY, markdown TEXT NOT NULL)')
+
+    def get(self, key):
+        with self._lock:
+            row = self._connection.execute(
+                'SELECT markdown FROM markdown WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else None
+
+    def set(self, key, markdown):
+        with self._lock, self._connection:
+            self._connection.execute(
+                'INSERT OR REPLACE INTO markdown VALUES (?, ?)', (key, markdown))
+
+    def __len__(self):
+        with self._lock:
+            return self._connection.execute('SELECT COUNT(*) FROM markdown').fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+
+class CachedConverter(object):
+    """
+    Convert with converter, caching the results in memory, in a least
+    recently used cache of up to maxsize results, and optionally in a
+    SqliteStore or any object with the same get() and set() methods.
+
+    Results are keyed by a hash of the HTML and the fingerprint() of the
+    converter, so a cache shared by converters with different options or
+    classes, or by different versions of a converter class, never returns
+    a stale result.
+    """
+
+    def __init__(self, converter, maxsize=1024, store=None):
+        self.converter = converter
+        self.maxsize = maxsize
+        self.store = store
+        self._fingerprint = fingerprint(converter)
+        self._results = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = self._store_hits = self._misses = 0
+
+    def _key(self, kind, html):
+        digest = hashlib.blake2b(self._fingerprint.encode('ascii'), digest_size=16)
+        digest.update(kind)
+        if isinstance(html, str):
+            digest.update(html.encode('utf-8', 'surrogatepass'))
+        else:
+            # Key undecoded bytes apart from any text: UTF-8 has no 0xff byte.
+            digest.update(b'\xff')
+            digest.update(html)
+        return digest.hexdigest()
+
+    def convert(self, html):
+        """
+        Return converter.convert(html), from the cache if possible. A file
+        object is read to key its content.
+        """
+        if hasattr(html, 'read') and not isinstance(html, mmap.mmap):
+            html = html.read()
+        return self._cached(self._key(b'html', html), self.converter.convert, html)
+
+    def convert_soup(self, soup):
+        """
+        Return converter.convert_soup(soup), from the cache if possible. The
+        soup is keyed by its serialized HTML.
+        """
+        return self._cached(self._key(b'soup', str(soup)), self.converter.convert_soup, soup)
+
+    def _cached(self, key, convert, *args):
+        with self._lock:
+            markdown = self._results.get(key)
+            if markdown is not None:
+                self._results.move_to_end(key)
+                self._hits += 1
+                return markdown
+
+        markdown = self.store.get(key) if self.store is not None else None
+        if markdown is None:
+            markdown = convert(*args)
+            if self.store is not None:
+                self.store.set(key, markdown)
+            hit = False
+        else:
+            hit = True
+
+        with self._lock:
+            if hit:
+                self._store_hits += 1
+            else:
+                self._misses += 1
+            self._results[key] = markdown
+            if len(self._results) > self.maxsize:
+                self._results.popitem(last=False)
+        return markdown
+
+    def cache_info(self):
+        """
+        Return the numbers of results found in memory and in the store, of
+        results converted, and the maximum and current numbers of results in
+        memory.
+        """
+        with self._lock:
+            return CacheInfo(self._hits, self._store_hits, self._misses,
+                             self.maxsize, len(self._results))
+
+    def cache_clear(self):
+        """Clear the results in memory and the statistics."""
+        with self._lock:
+            self._results.clear()
+            self._hits = self._store_hits = self._misses = 0
@@ -0,0 +1,92 @@
+"""
+Convert successive versions of a document, reconverting only the subtrees
+that changed.
+
+"""
+from markdownify import MarkdownConverter, _number_subtrees, _SubtreeMemo, _TagFrame
+
+
+class _VersionMemo(_SubtreeMemo):
+    """
+    The converted subtrees of one version of a ConvertedDocument. Identical
+    subtrees of all the versions share a number, so that the results of the
+    previous version are found by key().
+
+    The results are kept for the tags with sibling tags: a tag that is the
+    only child tag of its parent changes with it. This bounds the results
+    kept for deeply nested documents.
+    """
+    __slots__ = ('numbers',)
+
+    def __init__(self, root, numbers, results):
+        # Reuse the numbers of the subtrees of the previous version, keeping
+        # only those of this version.
+        self.numbers = {}
+        next_number = max(numbers.values(), default=-1) + 1
+
+        def number(structure):
+            result = self.numbers.get(structure)
+            if result is None:
+                result = numbers.get(structure)
+                if result is None:
+                    result = next_number + len(self.numbers)
+                self.numbers[structure] = result
+            return result
+
+        ids = _number_subtrees(root, number)
+        self.ids = {}
+        for parent in [root] + root.find_all(True):
+            tags = [child for child in parent.contents if child.name is not None]
+            if len(tags) > 1:
+                self.ids.update((id(tag), ids[id(tag)]) for tag in tags)
+        self.results = results
+
+
+class ConvertedDocument(object):
+    """
+    A document converted by converter, which update() converts again from new
+    HTML, reusing the Markdown of the subtrees unchanged since the previous
+    version. The result is always that of converter.convert(html).
+
+    As with the memoize_subtrees option, a subtree is reused where it is
+    converted in the same parent context, other than list items, lists and
+    table rows and sections, whose conversion depends on their siblings. The
+    whole document is converted again if the converter overrides convert(),
+    convert_soup(), process_element() or process_tag().
+
+    - markdown: the Markdown of the last HTML converted
+    """
+
+    def __init__(self, converter, html):
+        self.converter = converter
+        self._numbers = {}
+        self._results = {}
+        self.update(html)
+
+    def update(self, html):
+        """Convert html, reusing the unchanged subtrees; return the Markdown."""
+        converter = self.converter
+        if type(converter).convert is not MarkdownConverter.convert:
+            # A subclass converting documents its own way converts them whole.
+            self.markdown = converter.convert(html)
+            return self.markdown
+        soup = converter._parse(html)
+        if converter._overrides_processing() or (
+                type(converter).convert_soup is not MarkdownConverter.convert_soup):
+            self.markdown = converter.convert_soup(soup)
+            return self.markdown
+
+        # Convert the document as process_tag() does, with the results of the
+        # previous version.
+        memo = _VersionMemo(soup, self._numbers, self._results)
+        frame = _TagFrame(converter, soup, set())
+        frame.parent_tags_for_children.memo = memo
+        frame.child_strings.extend(converter._iter_child_strings(frame))
+        self.markdown = converter._finish_tag(frame)
+
+        # Keep the results of the subtrees of this version.
+        numbers = set(memo.ids.values())
+        self._numbers = memo.numbers
+        self._results = dict((key, text) for key, text in memo.results.items()
+                             if key[0] in numbers)
+        return self.markdown
@@ -1,10 +1,226 @@
 #!/usr/bin/env python
 
 import argparse
+import contextlib
+import glob
+import itertools
+import os
+import signal
 import sys
+import time
 
-from markdownify import markdownify, ATX, ATX_CLOSED, UNDERLINED, \
-    SPACES, BACKSLASH, ASTERISK, UNDERSCORE
+from markdownify import MarkdownConverter, ATX, ATX_CLOSED, UNDERLINED, \
+    SPACES, BACKSLASH, ASTERISK, UNDERSCORE, _write_pieces
+
+# File extensions of the html files converted in directories
+HTML_EXTENSIONS = ('.html', '.htm')
+
+# The number of characters read at a time with --stream
+STREAM_CHUNK_SIZE = 65536
+
+# File extensions of the --output files compressed with zstd
+ZSTD_EXTENSIONS = ('.zst', '.zstd')
+
+
+def _glob_base(pattern):
+    """Return the directory of the glob pattern before its first wildcard."""
+    base = pattern
+    while glob.has_magic(base):
+        base = os.path.dirname(base)
+    return base or os.curdir
+
+
+def _find_inputs(paths):
+    """
+    Expand file, directory and glob pattern arguments, returning a list of
+    (path, relative_path) pairs, where relative_path is the path below its
+    directory argument, or below the directory of a glob pattern argument
+    before its first wildcard, or the file name for file arguments.
+    """
+    inputs = []
+    for path in paths:
+        if os.path.isdir(path):
+            for dirpath, dirnames, filenames in os.walk(path):
+                dirnames.sort()
+                for filename in sorted(filenames):
+                    if filename.lower().endswith(HTML_EXTENSIONS):
+                        file_path = os.path.join(dirpath, filename)
+                        inputs.append((file_path, os.path.relpath(file_path, path)))
+        elif glob.has_magic(path):
+            base = _glob_base(path)
+            for file_path in sorted(glob.glob(path, recursive=True)):
+                if os.path.isfile(file_path):
+                    inputs.append((file_path, os.path.relpath(file_path, base)))
+        else:
+            inputs.append((path, os.path.basename(path)))
+    return inputs
+
+
+def _read(path):
+    # (undecoded, for the parser to sniff the encoding)
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def _open_output(path):
+    """
+    Open the binary file that --output writes to, compressed with gzip or
+    zstd if its name ends with .gz or .zst. Raises ImportError if no zstd
+    module is available.
+    """
+    if path.endswith('.gz'):
+        import gzip
+        return gzip.open(path, 'wb')
+    if path.endswith(ZSTD_EXTENSIONS):
+        try:
+            from compression import zstd  # Python 3.14
+        except ImportError:
+            import zstandard as zstd
+        return zstd.open(path, 'wb')
+    return open(path, 'wb')
+
+
+def _convert_each(htmls, converter):
+    """Convert htmls in this process, yielding (index, result) pairs like convert_many()."""
+    for index, html in enumerate(htmls):
+        try:
+            yield index, converter.convert(html)
+        except Exception as e:
+            yield index, e
+
+
+def _serve(socket_path, options):
+    """Serve conversions on stdin and stdout or socket_path, returning the exit status."""
+    from markdownify.serve import ConverterPool, make_server, serve_stream
+
+    pool = ConverterPool(**options)
+    if not socket_path:
+        serve_stream(sys.stdin.buffer, sys.stdout.buffer, pool)
+        return 0
+    try:
+        server = make_server(socket_path, pool)
+    except OSError as e:
+        sys.stderr.write('markdownify: %s\n' % e)
+        return 1
+    # Remove the socket file when terminated, as on an interrupt.
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+def _convert_remote(socket_path, html, options):
+    """
+    Convert html with options by the server listening on socket_path,
+    returning None if there is none.
+    """
+    from markdownify.serve import Client
+
+    try:
+        client = Client(socket_path)
+    except OSError:
+        return None
+    if isinstance(html, bytes):
+        from bs4.dammit import UnicodeDammit
+        html = UnicodeDammit(html, is_html=True).unicode_markup
+    with client:
+        return client.convert(html, **options)
+
+
+def _open_input(path, binary):
+    """
+    Open the html file at path in binary or text mode, or return a context
+    manager yielding STDIN if path is None. Raises OSError if the file
+    cannot be opened.
+    """
+    if path is None:
+        return contextlib.nullcontext(getattr(sys.stdin, 'buffer', sys.stdin) if binary else sys.stdin)
+    return open(path, 'rb' if binary else 'r')
+
+
+def _convert_files(paths, output_dir, suffix, jobs, update, encoding, options):
+    """
+    Convert html files to Markdown files encoded with encoding, returning the
+    exit status.
+    """
+    from markdownify.batch import convert_many
+
+    start = time.perf_counter()
+    sources = []
+    targets = []
+    target_sources = {}
+    skipped = failed = 0
+    for path, relative_path in _find_inputs(paths):
+        if not os.path.isfile(path):
+            failed += 1
+            sys.stderr.write('markdownify: %s: No such file\n' % path)
+            continue
+        target = os.path.splitext(relative_path if output_dir else path)[0] + suffix
+        if output_dir:
+            target = os.path.join(output_dir, target)
+        other = target_sources.setdefault(os.path.abspath(target), path)
+        if other != path:
+            failed += 1
+            sys.stderr.write('markdownify: %s: %s is also converted to %s\n' % (path, other, target))
+            continue
+        if (update and os.path.exists(target)
+                and os.path.getmtime(target) >= os.path.getmtime(path)):
+            skipped += 1
+            continue
+        sources.append(path)
+        targets.append(target)
+
+    converted = input_bytes = 0
+    read_errors = {}
+
+    def read_sources():
+        for index, path in enumerate(sources):
+            try:
+                yield _read(path)
+            except OSError as e:
+                # (reported with the result of the empty document in its place)
+                read_errors[index] = e
+                yield ''
+
+    htmls = read_sources()
+    if options['profile']:
+        # Convert in this process, to report the statistics of all the files.
+        converter = MarkdownConverter(**options)
+        results = _convert_each(htmls, converter)
+    else:
+        converter = None
+        results = convert_many(htmls, workers=jobs, ordered=False, **options)
+    for index, result in results:
+        result = read_errors.pop(index, result)
+        if isinstance(result, Exception):
+            failed += 1
+            sys.stderr.write('markdownify: %s: %s\n' % (sources[index], result))
+            continue
+        try:
+            target_dir = os.path.dirname(targets[index])
+            if target_dir:
+                os.makedirs(target_dir, exist_ok=True)
+            with open(targets[index], 'wb') as f:
+                _write_pieces([result], f, encoding)
+        except (OSError, UnicodeError) as e:
+            failed += 1
+            sys.stderr.write('markdownify: %s: %s\n' % (targets[index], e))
+            continue
+        converted += 1
+        input_bytes += os.path.getsize(sources[index])
+
+    elapsed = max(time.perf_counter() - start, 1e-9)
+    sys.stderr.write('markdownify: converted %d files (%d bytes) in %.2f s: '
+                     '%.1f files/s, %.0f bytes/s; %d skipped, %d failed\n'
+                     % (converted, input_bytes, elapsed, converted / elapsed,
+                        input_bytes / elapsed, skipped, failed))
+    if converter is not None:
+        sys.stderr.write(converter.stats.report())
+    return 1 if failed else 0
 
 
 def main(argv=sys.argv[1:]):
@@ -13,10 +229,32 @@ def main(argv=sys.argv[1:]):
         description='Converts html to markdown.',
     )
 
-    parser.add_argument('html', nargs='?', type=argparse.FileType('r'),
-                        default=sys.stdin,
-                        help="The html file to convert. Defaults to STDIN if not "
-                        "provided.")
+    parser.add_argument('html', nargs='*',
+                        help="The html files to convert: file names, directories "
+                        "(converting the .html and .htm files below them) or glob "
+                        "patterns. Defaults to STDIN if not provided. A single file "
+                        "is converted to STDOUT, unless --output-dir or --suffix is "
+                        "given.")
+    parser.add_argument('--output-dir',
+                        help="Write the Markdown files to this directory, mirroring "
+                        "the layout of directory and glob pattern arguments, instead "
+                        "of next to the html files.")
+    parser.add_argument('-o', '--output', metavar='PATH',
+                        help="Write the Markdown of a single document to this file "
+                        "instead of STDOUT, compressed with gzip if its name ends "
+                        "with .gz, or with zstd if it ends with .zst.")
+    parser.add_argument('--output-encoding', default='utf-8',
+                        help="The encoding of the Markdown written to STDOUT, "
+                        "--output or the Markdown files. Defaults to 'utf-8'.")
+    parser.add_argument('--suffix',
+                        help="The file extension that replaces the extension of the "
+                        "html files for the Markdown files. Defaults to '.md'.")
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help="The number of files to convert in parallel, in worker "
+                        "processes. 0 uses one process per CPU.")
+    parser.add_argument('-u', '--update', action='store_true',
+                        help="Only convert files whose Markdown file is missing or "
+                        "older than the html file.")
     parser.add_argument('-s', '--strip', nargs='*',
                         help="A list of tags to strip. This option can't be used with "
                         "the --convert option.")
@@ -65,12 +303,109 @@ def main(argv=sys.argv[1:]):
                         action='store_true',
                         help="When a table has no header row (as indicated by '<thead>' "
                         "or '<th>'), use the first body row as the header row.")
+    parser.add_argument('--memoize-subtrees', action='store_true',
+                        help="Convert subtrees repeated in a document once, and "
+                        "reuse the result for their copies.")
+    parser.add_argument('--profile', action='store_true',
+                        help="Write the time spent in each phase of the conversion "
+                        "and in each conversion function to stderr. Files are then "
+                        "converted in a single process.")
+    parser.add_argument('-p', '--parser', default='html.parser',
+                        help="The BeautifulSoup parser used to read the html, for "
+                        "example 'html.parser' (the default), 'lxml' or 'html5lib'.")
     parser.add_argument('-w', '--wrap', action='store_true',
                         help="Wrap all text paragraphs at --wrap-width characters.")
     parser.add_argument('--wrap-width', type=int, default=80)
+    parser.add_argument('--stream', action='store_true',
+                        help="Convert a single document as it is read, writing the "
+                        "Markdown of each top-level block as soon as it is parsed, "
+                        "so that large documents take little memory. Requires the "
+                        "'html.parser' parser.")
+    parser.add_argument('--serve', action='store_true',
+                        help="Keep converting requests until the end of STDIN, or "
+                        "from connections to --socket if given: one JSON object "
+                        "per line, with the 'html' to convert and optionally an "
+                        "'id' and 'options' overriding the other arguments. "
+                        "Each response is a JSON object on one line, with the "
+                        "'id' and the 'markdown' or an 'error'.")
+    parser.add_argument('--socket', metavar='PATH',
+                        help="The Unix socket that --serve listens on. Without "
+                        "--serve, a single document is converted by the server "
+                        "listening on it, if there is one.")
 
     args = parser.parse_args(argv)
-    print(markdownify(**vars(args)))
+    options = vars(args)
+    paths = options.pop('html')
+    output_dir = options.pop('output_dir')
+    suffix = options.pop('suffix')
+    jobs = options.pop('jobs')
+    update = options.pop('update')
+    stream = options.pop('stream')
+    output = options.pop('output')
+    output_encoding = options.pop('output_encoding')
+    serve = options.pop('serve')
+    socket_path = options.pop('socket')
+
+    if serve:
+        if paths or output:
+            parser.error('--serve reads its requests, not html files, and writes its responses to STDOUT')
+        if options['profile']:
+            parser.error('--profile cannot be used with --serve')
+        sys.exit(_serve(socket_path, options))
+
+    if (len(paths) > 1 or output_dir or suffix
+            or any(os.path.isdir(path) or glob.has_magic(path) for path in paths)):
+        if output:
+            parser.error('--output writes a single document; use --output-dir for several')
+        sys.exit(_convert_files(paths, output_dir, suffix or '.md', jobs, update,
+                                output_encoding, options))
+
+    if stream and options['parser'] != 'html.parser':
+        parser.error("--stream requires the 'html.parser' parser")
+    try:
+        source = _open_input(paths[0] if paths else None, binary=not stream)
+    except OSError as e:
+        parser.error("argument html: can't open '%s': %s" % (paths[0], e))
+    if output:
+        try:
+            sink = _open_output(output)
+        except ImportError:
+            parser.error('writing zstd files requires Python 3.14 or the zstandard package')
+    else:
+        # Write the encoded Markdown to stdout, without newline translation.
+        sys.stdout.flush()
+        sink = getattr(sys.stdout, 'buffer', sys.stdout)
+
+    converter = None
+    try:
+        with source as f:
+            if stream:
+                from markdownify.stream import iter_convert_chunks
+
+                converter = MarkdownConverter(**options)
+                pieces = iter_convert_chunks(converter, iter(lambda: f.read(STREAM_CHUNK_SIZE), ''))
+            else:
+                # Pass the binary file to the converter, which maps a regular
+                # file into memory and sniffs its encoding.
+                html = f
+                markdown = None
+                if socket_path and not options['profile']:
+                    html = f.read()
+                    markdown = _convert_remote(socket_path, html, options)
+                if markdown is not None:
+                    pieces = [markdown]
+                else:
+                    converter = MarkdownConverter(**options)
+                    # (the statistics time the conversion of whole documents)
+                    pieces = [converter.convert(html)] if options['profile'] else converter.iter_convert(html)
+            _write_pieces(itertools.chain(pieces, ['\n']), sink, output_encoding)
+    finally:
+        if output:
+            sink.close()
+        else:
+            sink.flush()
+    if converter is not None and converter.stats is not None:
+        sys.stderr.write(converter.stats.report())
 
 
 if __name__ == '__main__':
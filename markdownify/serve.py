@@ -0,0 +1,160 @@
+"""
+Serve conversions from a long-running process, over stdin and stdout or a
+Unix socket, so that a pipeline converting many small documents starts the
+interpreter and imports BeautifulSoup once.
+
+The protocol is newline-delimited JSON. Each request is a JSON object on one
+line, with the "html" to convert and, optionally, an "id" and "options"
+overriding the options of the server. Each response is a JSON object on one
+line, with the "id" of the request and the "markdown", or an "error" message
+if the request could not be converted. Responses are written in the order of
+the requests.
+"""
+import json
+import os
+import socket
+import threading
+
+from markdownify import MarkdownConverter
+
+
+class ConverterPool(object):
+    """
+    The converters of a server, one for each distinct set of request options,
+    created with the options of the server overridden by those of the
+    request. Converters are shared between connections and threads; the
+    least recently used is discarded beyond maxsize.
+    """
+
+    def __init__(self, converter_class=MarkdownConverter, maxsize=32, **options):
+        self.converter_class = converter_class
+        self.maxsize = maxsize
+        self.options = options
+        self._converters = {}
+        self._lock = threading.Lock()
+
+    def get(self, options=None):
+        key = json.dumps(options or {}, sort_keys=True)
+        with self._lock:
+            converter = self._converters.pop(key, None)
+        if converter is None:
+            converter = self.converter_class(**dict(self.options, **(options or {})))
+        with self._lock:
+            self._converters[key] = converter
+            while len(self._converters) > self.maxsize:
+                del self._converters[next(iter(self._converters))]
+        return converter
+
+
+def handle_request(line, pool):
+    """Convert one request line, as text or UTF-8 bytes, returning the response object."""
+    request_id = None
+    try:
+        if isinstance(line, bytes):
+            line = line.decode('utf-8')
+        request = json.loads(line)
+        if not isinstance(request, dict):
+            raise ValueError('a request must be a JSON object')
+        request_id = request.get('id')
+        html = request['html']
+        options = request.get('options')
+        if options is not None and not isinstance(options, dict):
+            raise ValueError('the options must be a JSON object')
+        return {'id': request_id, 'markdown': pool.get(options).convert(html)}
+    except KeyError as e:
+        return {'id': request_id, 'error': 'missing %s' % e}
+    except Exception as e:
+        return {'id': request_id, 'error': '%s: %s' % (type(e).__name__, e)}
+
+
+def serve_stream(rfile, wfile, pool):
+    """
+    Answer the requests read from the binary file rfile until its end,
+    writing the responses to the binary file wfile.
+    """
+    for line in rfile:
+        if not line.strip():
+            continue
+        response = handle_request(line, pool)
+        wfile.write(json.dumps(response).encode('utf-8') + b'\n')
+        wfile.flush()
+
+
+def _socket_in_use(path):
+    """Return whether a server is listening on the Unix socket path."""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+    except OSError:
+        return False
+    finally:
+        sock.close()
+    return True
+
+
+def make_server(path, pool):
+    """
+    Return a server answering the requests of each connection to the Unix
+    socket path in a thread, replacing a stale socket file.
+    """
+    import socketserver
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            serve_stream(self.rfile, self.wfile, pool)
+
+    class Server(socketserver.ThreadingUnixStreamServer):
+        daemon_threads = True
+
+        def server_close(self):
+            super().server_close()
+            if os.path.exists(path):
+                os.unlink(path)
+
+    if os.path.exists(path):
+        if _socket_in_use(path):
+            raise OSError('a server is already listening on %s' % path)
+        os.unlink(path)
+    return Server(path, Handler)
+
+
+class Client(object):
+    """
+    A connection to a server listening on a Unix socket, converting with the
+    options of the server, overridden by those passed to convert(). Raises
+    OSError if no server is listening.
+    """
+
+    def __init__(self, path, timeout=None):
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            self._sock.settimeout(timeout)
+            self._sock.connect(path)
+        except OSError:
+            self._sock.close()
+            raise
+        self._rfile = self._sock.makefile('rb')
+        self._ids = 0
+
+    def convert(self, html, **options):
+        """Convert html on the server, raising ValueError if it fails."""
+        self._ids += 1
+        request = {'id': self._ids, 'html': html, 'options': options}
+        self._sock.sendall(json.dumps(request).encode('utf-8') + b'\n')
+        line = self._rfile.readline()
+        if not line:
+            raise ConnectionError('the server closed the connection')
+        response = json.loads(line.decode('utf-8'))
+        if 'error' in response:
+            raise ValueError(response['error'])
+        return response['markdown']
+
+    def close(self):
+        self._rfile.close()
+        self._sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
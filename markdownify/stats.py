@@ -0,0 +1,117 @@
+"""
+Profile conversions: call counts and times by phase, conversion function and
+document, collected by converters created with the profile option.
+
+"""
+from collections import defaultdict
+import functools
+import time
+
+from markdownify import _conv_fn_dispatch
+
+
+# The converter methods timed as the phases of a conversion
+PHASES = (
+    ('_parse', 'parse'),
+    ('_collect_children', 'whitespace'),
+    ('process_text', 'text'),
+    ('escape', 'escape'),
+    ('_join_child_strings', 'collapse and join'),
+)
+
+# The converter methods replaced by ConversionStats.instrument()
+INSTRUMENTED = tuple(method for method, phase in PHASES) + ('get_conv_fn', 'convert_soup')
+
+
+class ConversionStats(object):
+    """
+    Call counts and cumulative times in seconds of the phases of the
+    conversions of a converter, of its conversion functions (named as the
+    convert_* methods) and of its documents.
+
+    The times are inclusive: the text phase includes the escape phase. The
+    time of a conversion function does not include converting the children
+    of the tag. The counts may be slightly off for a converter used by
+    several threads at once.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Clear the collected statistics."""
+        self.phase_calls = defaultdict(int)
+        self.phase_times = defaultdict(float)
+        self.hook_calls = defaultdict(int)
+        self.hook_times = defaultdict(float)
+        self.document_times = []
+
+    def _timed(self, calls, times, key, fn):
+        """Return fn, counting its calls and time under key."""
+        perf_counter = time.perf_counter
+
+        @functools.wraps(fn)
+        def timed(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                times[key] += perf_counter() - start
+                calls[key] += 1
+        return timed
+
+    def instrument(self, converter):
+        """
+        Time the phases, conversion functions and documents of converter, by
+        replacing its INSTRUMENTED methods with timed ones.
+        """
+        for method, phase in PHASES:
+            setattr(converter, method, self._timed(
+                self.phase_calls, self.phase_times, phase, getattr(converter, method)))
+
+        get_conv_fn = converter.get_conv_fn
+
+        def get_timed_conv_fn(tag_name):
+            convert_fn = get_conv_fn(tag_name)
+            if convert_fn is None:
+                return None
+            key = _conv_fn_dispatch(tag_name)[2]
+            return self._timed(self.hook_calls, self.hook_times, key, convert_fn)
+        converter.get_conv_fn = get_timed_conv_fn
+
+        convert_soup = converter.convert_soup
+
+        @functools.wraps(convert_soup)
+        def timed_convert_soup(soup):
+            start = time.perf_counter()
+            try:
+                return convert_soup(soup)
+            finally:
+                self.document_times.append(time.perf_counter() - start)
+        converter.convert_soup = timed_convert_soup
+
+    def as_dict(self):
+        """Return the statistics as a dict, for example to serialize as JSON."""
+        return {
+            'phases': dict((key, {'calls': self.phase_calls[key], 'seconds': self.phase_times[key]})
+                           for key in self.phase_calls),
+            'hooks': dict((key, {'calls': self.hook_calls[key], 'seconds': self.hook_times[key]})
+                          for key in self.hook_calls),
+            'documents': {'count': len(self.document_times),
+                          'seconds': sum(self.document_times),
+                          'slowest_seconds': max(self.document_times or [0])},
+        }
+
+    def report(self):
+        """Return the statistics as a table, slowest first."""
+        lines = ['%-28s %10s %12s %12s' % ('', 'calls', 'total s', 'per call us')]
+        for title, calls, times in (('phases', self.phase_calls, self.phase_times),
+                                    ('conversion functions', self.hook_calls, self.hook_times)):
+            lines.append(title)
+            for key in sorted(times, key=times.get, reverse=True):
+                lines.append('  %-26s %10d %12.4f %12.2f'
+                             % (key, calls[key], times[key], times[key] / calls[key] * 1e6))
+        documents = self.document_times
+        lines.append('documents %d, %.4f s in total, slowest %.4f s'
+                     % (len(documents), sum(documents), max(documents or [0])))
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,367 @@
+"""
+Convert HTML fed in chunks, holding only the part of the document that is
+still being converted in memory.
+
+The chunks are parsed incrementally by the 'html.parser' tree builder of
+BeautifulSoup. The children of the document, and of the open tags that have
+no conversion function of their own (such as <html> or <body>) or are
+converted as blocks by convert_div() (<div>, <article> and <section>), are
+converted as soon as they are complete and then discarded, so that
+converting a document of many blocks takes memory proportional to its
+largest block rather than to its size.
+
+A child is complete once it is closed; text, and lists (whose conversion
+depends on their next sibling), are converted once their next sibling is
+parsed or their parent is closed. A <tbody> outside of a table waits for its
+parent to close, as its rows depend on the <thead> tags of the parent. The
+conversion functions of the children may look at their own subtree, their
+parent, their previous sibling and the following siblings, but not at the
+earlier siblings, which have been discarded. Converters whose conversion functions rely on more of the
+document should convert it whole.
+"""
+import codecs
+
+from markdownify import LSTRIP, RSTRIP, STRIP, MarkdownConverter, _can_ignore_child, \
+    _next_block_content_sibling, _positional_tags, _strip_newlines, \
+    should_remove_whitespace_inside
+
+
+# The number of bytes decoded at a time by parse_bytes()
+CHUNK_SIZE = 65536
+
+
+class _ChunkParser(object):
+    """A BeautifulSoup object built incrementally from chunks of HTML."""
+
+    def __init__(self, chunks):
+        from bs4 import BeautifulSoup
+        from bs4.builder._htmlparser import BeautifulSoupHTMLParser
+
+        self.soup = BeautifulSoup('', 'html.parser')
+        args, kwargs = self.soup.builder.parser_args
+        try:
+            self._parser = BeautifulSoupHTMLParser(self.soup, *args, **kwargs)
+        except TypeError:
+            # (beautifulsoup4 < 4.13 sets the soup after construction)
+            self._parser = BeautifulSoupHTMLParser(*args, **kwargs)
+        self._parser.soup = self.soup
+        self._chunks = iter(chunks)
+        self.done = False
+
+        # Count the <thead> tags parsed and discarded, for discard().
+        self.theads = self.discarded_theads = 0
+        handle_starttag = self.soup.handle_starttag
+
+        def handle_starttag_counting(name, *args, **kwargs):
+            if name == 'thead':
+                self.theads += 1
+            return handle_starttag(name, *args, **kwargs)
+        self.soup.handle_starttag = handle_starttag_counting
+
+    def feed(self):
+        """
+        Parse the next chunk, or close the document after the last chunk.
+        Return False if the document was already closed.
+        """
+        if self.done:
+            return False
+        for chunk in self._chunks:
+            if chunk:
+                self._parser.feed(chunk)
+                return True
+        self._parser.close()
+        soup = self.soup
+        soup.endData()
+        while soup.currentTag is not None and soup.currentTag.name != soup.ROOT_TAG_NAME:
+            soup.popTag()
+        self.done = True
+        return True
+
+    def is_open(self, tag):
+        """Return whether tag may still get children."""
+        return any(open_tag is tag for open_tag in self.soup.tagStack)
+
+    def discard(self, el, children_only=False):
+        """Decompose el, or only its children, counting the <thead> tags."""
+        if self.theads and el.name is not None:
+            self.discarded_theads += len(el.find_all('thead'))
+            if el.name == 'thead' and not children_only:
+                self.discarded_theads += 1
+        for node in list(el.contents) if children_only else [el]:
+            # (strings have no decompose() before beautifulsoup4 4.13)
+            if node.name is not None:
+                node.decompose()
+            else:
+                node.extract()
+
+
+def _declared_encodings(data):
+    """
+    Return the encodings to try for the HTML bytes data, in the order of
+    BeautifulSoup, and the length of its byte order mark. Return None for
+    the encodings if BeautifulSoup would guess them with a character set
+    detection library.
+    """
+    import bs4.dammit
+    from bs4.dammit import EncodingDetector
+
+    head = bytes(data[:4])
+    stripped, sniffed = EncodingDetector.strip_byte_order_mark(head)
+    start = len(head) - len(stripped)
+    # (BeautifulSoup searches the first 5% of the document, and at least 2 kB)
+    end = start + max(2048, int((len(data) - start) * 0.05))
+    declared = EncodingDetector.find_declared_encoding(
+        bytes(data[start:end]), is_html=True, search_entire_document=True)
+    if sniffed is None and declared is None and getattr(bs4.dammit, 'chardet_module', None):
+        return None, start
+    return [sniffed, declared, 'utf-8', 'windows-1252'], start
+
+
+def _decoded_chunks(data, start, codec):
+    """Decode data from start with codec, yielding chunks of text."""
+    decoder = codecs.getincrementaldecoder(codec)('strict')
+    for offset in range(start, len(data), CHUNK_SIZE):
+        yield decoder.decode(data[offset:offset + CHUNK_SIZE])
+    yield decoder.decode(b'', True)
+
+
+def parse_bytes(data):
+    """
+    Parse the HTML bytes data, or any object that is sliced into bytes such
+    as an mmap, with the 'html.parser' parser, returning a BeautifulSoup
+    object equal to BeautifulSoup(data, 'html.parser').
+
+    The encoding is sniffed as by BeautifulSoup, from a byte order mark or an
+    encoding declared in the document, and otherwise tried from UTF-8 to
+    windows-1252. The document is decoded in chunks as it is parsed, rather
+    than into a copy of the whole text.
+    """
+    from bs4 import BeautifulSoup
+    from bs4.dammit import UnicodeDammit
+
+    encodings, start = _declared_encodings(data)
+    if encodings is not None:
+        dammit = UnicodeDammit('')  # (for find_codec() only)
+        tried = set()
+        for encoding in encodings:
+            codec = dammit.find_codec(encoding) if encoding else None
+            if codec is None or codec in tried:
+                continue
+            tried.add(codec)
+            try:
+                codecs.lookup(codec)
+                source = _ChunkParser(_decoded_chunks(data, start, codec))
+                while source.feed():
+                    pass
+            except (LookupError, ValueError):  # (including UnicodeDecodeError)
+                continue
+            return source.soup
+    # Guessing the encoding or replacing undecodable bytes needs the whole document.
+    return BeautifulSoup(bytes(data), 'html.parser')
+
+
+def _collapse_newlines(children):
+    """
+    Like markdownify._collapse_newlines(), but for child strings given as
+    iterables of pieces, yielding the pieces of the joined string.
+    """
+    prev_trailing_nl = ''
+    for pieces in children:
+        leading_nl = ''
+        held_nl = ''
+        started = False
+        for piece in pieces:
+            if not started:
+                content = piece.lstrip('\n')
+                leading_nl += piece[:len(piece) - len(content)]
+                if not content:
+                    continue
+                started = True
+                piece = content
+                # If the last child had trailing newlines and this child has
+                # leading newlines, use the larger newline count, limited to 2.
+                if prev_trailing_nl and leading_nl:
+                    yield '\n' * min(2, max(len(prev_trailing_nl), len(leading_nl)))
+                else:
+                    yield prev_trailing_nl + leading_nl
+            # Hold the trailing newlines of the child until it ends.
+            content = piece.rstrip('\n')
+            if content:
+                yield held_nl + content
+                held_nl = piece[len(content):]
+            else:
+                held_nl += piece
+        if started:
+            prev_trailing_nl = held_nl
+        elif leading_nl:
+            # A child of newlines only
+            if prev_trailing_nl:
+                yield '\n' * min(2, max(len(prev_trailing_nl), len(leading_nl)))
+            else:
+                yield leading_nl
+            prev_trailing_nl = ''
+    yield prev_trailing_nl
+
+
+def _convert_div(pieces):
+    """Apply MarkdownConverter.convert_div() outside of inline parents to the pieces of a text."""
+    started = False
+    held = ''  # trailing whitespace that may end the text
+    for piece in pieces:
+        if not started:
+            piece = piece.lstrip()
+            if not piece:
+                continue
+            started = True
+            yield '\n\n'
+        content = piece.rstrip()
+        if content:
+            yield held + content
+            held = piece[len(content):]
+        else:
+            held += piece
+    if started:
+        yield '\n\n'
+
+
+def _method(convert_fn):
+    """Return the function of a conversion method, unwrapping the methods timed by the profile option."""
+    return getattr(getattr(convert_fn, '__wrapped__', convert_fn), '__func__', None)
+
+
+def _iter_children(converter, source, node, parent_tags):
+    """
+    Convert the children of node as they are parsed, yielding the converted
+    string of each as an iterable of pieces, and discarding them once their
+    next sibling is converted.
+    """
+    should_remove_inside = should_remove_whitespace_inside(node)
+    discarded_theads = source.discarded_theads
+    el = None
+    while True:
+        # Wait for the next child.
+        next_el = el.next_sibling if el is not None else (node.contents[0] if node.contents else None)
+        while next_el is None and source.is_open(node) and source.feed():
+            next_el = el.next_sibling if el is not None else (node.contents[0] if node.contents else None)
+        if next_el is None:
+            return
+        if el is not None and el.previous_sibling is not None:
+            source.discard(el.previous_sibling)
+        el = next_el
+
+        if el.name is None:
+            # Text depends on its next sibling.
+            while el.next_sibling is None and source.is_open(node) and source.feed():
+                pass
+            if not _can_ignore_child(el, should_remove_inside):
+                yield (converter.process_text(el, parent_tags=parent_tags),)
+            continue
+
+        parent_tags.tags_entered += 1
+        if el.name == 'li':
+            parent_tags.list_items += 1
+
+        convert_fn = converter.get_conv_fn_cached(el.name)
+        # (once the document is parsed whole, closed tags are split as well,
+        # so that the pieces are no larger than the blocks)
+        if (source.done or source.is_open(el)) and el.name not in _positional_tags and (
+                convert_fn is None
+                or (_method(convert_fn) is MarkdownConverter.convert_div
+                    and '_inline' not in parent_tags)):
+            # The tag only joins its children, or also strips the result and
+            # separates it as a block: convert them as they are parsed.
+            child_tags = converter._parent_tags_for_children(el, parent_tags)
+            if not child_tags.in_pre:
+                pieces = _collapse_newlines(_iter_children(converter, source, el, child_tags))
+                yield pieces if convert_fn is None else _convert_div(pieces)
+                continue
+
+        while source.is_open(el) and source.feed():
+            pass
+        if el.name in ('ul', 'ol'):
+            # Lists depend on their next content sibling.
+            while (_next_block_content_sibling(el) is None and source.is_open(node)
+                   and source.feed()):
+                pass
+        elif el.name == 'tbody':
+            # The rows of a table section depend on the number of <thead>
+            # tags in the parent of the section, discarded or not.
+            while source.is_open(node) and source.feed():
+                pass
+            if parent_tags._counts is None:
+                parent_tags._counts = {}
+            parent_tags._counts.setdefault(
+                'thead', source.discarded_theads - discarded_theads + len(node.find_all('thead')))
+        yield (converter.process_element(el, parent_tags=parent_tags),)
+        source.discard(el, children_only=True)
+
+
+class _ParsedSource(object):
+    """The source of _iter_children() for a document already parsed whole, which is kept."""
+
+    done = True
+    discarded_theads = 0
+
+    def feed(self):
+        return False
+
+    def is_open(self, tag):
+        return False
+
+    def discard(self, el, children_only=False):
+        pass
+
+
+def _iter_document(converter, source, soup):
+    """Convert the children of the document soup, parsed from source, yielding the Markdown in pieces."""
+    parent_tags = converter._parent_tags_for_children(soup, set())
+    return _collapse_newlines(_iter_children(converter, source, soup, parent_tags))
+
+
+def iter_convert_soup(converter, soup):
+    """
+    Convert the children of the document soup, parsed whole, yielding the
+    Markdown in pieces of at most a block, for MarkdownConverter.iter_convert_soup().
+    """
+    return _iter_document(converter, _ParsedSource(), soup)
+
+
+def iter_convert_chunks(converter, chunks):
+    """
+    Convert the HTML given as an iterable of string chunks with converter,
+    yielding the Markdown in pieces as the document is parsed. Joined, the
+    pieces equal converter.convert(''.join(chunks)).
+
+    The converter must use the 'html.parser' parser. If it overrides
+    convert(), convert_soup(), process_element(), process_tag() or the
+    document conversion function, the document is converted whole once
+    parsed.
+    """
+    if converter.options['parser'] != 'html.parser':
+        raise ValueError("Converting HTML in chunks requires the 'html.parser' parser")
+    if type(converter).convert is not MarkdownConverter.convert:
+        yield converter.convert(''.join(chunks))
+        return
+    source = _ChunkParser(chunks)
+    soup = source.soup
+
+    convert_fn = converter.get_conv_fn_cached(soup.name)
+    if converter._overrides_processing() or (
+            type(converter).convert_soup is not MarkdownConverter.convert_soup) or (
+            convert_fn is not None and _method(convert_fn) is not MarkdownConverter.convert__document_):
+        while source.feed():
+            pass
+        for piece in converter.iter_convert_soup(soup):
+            yield piece
+        return
+
+    # Apply the document-level formatting of convert__document_() to the pieces.
+    strip_document = converter.options['strip_document'] if convert_fn is not None else None
+    if strip_document not in (LSTRIP, RSTRIP, STRIP, None):
+        raise ValueError('Invalid value for strip_document: %s' % strip_document)
+
+    pieces = _iter_document(converter, source, soup)
+    for piece in _strip_newlines(pieces,
+                                 lstrip=strip_document in (LSTRIP, STRIP),
+                                 rstrip=strip_document in (RSTRIP, STRIP)):
+        yield piece
@@ -37,3 +37,11 @@ def test_code_with_tricky_content():
 def test_special_tags():
     assert md('<!DOCTYPE html>') == ''
     assert md('<![CDATA[foobar]]>') == 'foobar'
+
+
+def test_deeply_nested():
+    # deeper than the default recursion limit
+    depth = 5000
+    assert md('<div>' * depth + 'text' + '</div>' * depth) == '\n\ntext\n\n'
+    assert md('<span>' * depth + '<b>text</b>' + '</span>' * depth) == '**text**'
+    assert md('<blockquote>' * 3 + 'text' + '</blockquote>' * 3) == '\n> > > text\n\n'
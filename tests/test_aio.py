@@ -0,0 +1,129 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+import gzip
+import io
+import threading
+import time
+
+import pytest
+
+from markdownify import MarkdownConverter, markdownify
+from markdownify.aio import AsyncConverter, aconvert
+
+
+htmls = ['<h1>%d</h1><p>a <b>b</b></p><ul><li>x</li></ul>' % i for i in range(20)]
+
+
+class SlowConverter(MarkdownConverter):
+    """
+    Create a custom MarkdownConverter that records how many conversions run
+    at once, and sleeps on <i>
+    """
+    lock = threading.Lock()
+    running = 0
+    max_running = 0
+
+    def convert(self, html):
+        cls = type(self)
+        with cls.lock:
+            cls.running += 1
+            cls.max_running = max(cls.max_running, cls.running)
+        try:
+            return super().convert(html)
+        finally:
+            with cls.lock:
+                cls.running -= 1
+
+    def convert_i(self, el, text, parent_tags):
+        time.sleep(0.01 * len(text))
+        return text
+
+
+def test_aconvert():
+    async def main():
+        return await asyncio.gather(*[aconvert(html, heading_style='atx') for html in htmls])
+
+    assert asyncio.run(main()) == [markdownify(html, heading_style='atx') for html in htmls]
+
+
+def test_aconvert_limits():
+    async def main():
+        with pytest.raises(ValueError):
+            await aconvert('<b>x</b>', max_size=4)
+        with pytest.raises(asyncio.TimeoutError):
+            await aconvert('<i>%s</i>' % ('x' * 20), timeout=0.05, converter_class=SlowConverter)
+
+    asyncio.run(main())
+
+
+def test_async_converter():
+    async def main():
+        async with AsyncConverter(limit=3, converter_class=SlowConverter) as converter:
+            return await asyncio.gather(*[converter.convert(html + '<i>x</i>') for html in htmls])
+
+    # (wait for the conversions timed out by other tests)
+    while SlowConverter.running:
+        time.sleep(0.01)
+    SlowConverter.max_running = 0
+    assert asyncio.run(main()) == [SlowConverter().convert(html + '<i>x</i>') for html in htmls]
+    assert SlowConverter.max_running == 3
+
+
+def test_async_converter_timeout():
+    async def main():
+        async with AsyncConverter(limit=1, timeout=0.05, max_size=1000,
+                                  converter_class=SlowConverter) as converter:
+            with pytest.raises(ValueError):
+                await converter.convert('x' * 1001)
+            with pytest.raises(asyncio.TimeoutError):
+                await converter.convert('<i>%s</i>' % ('x' * 20))
+            # the next conversion waits for the timed out one to finish
+            return await converter.convert('<b>x</b>')
+
+    assert asyncio.run(main()) == '**x**'
+
+
+def test_async_converter_processes():
+    async def main():
+        with ProcessPoolExecutor(2) as executor:
+            converter = AsyncConverter(executor, limit=2, heading_style='atx')
+            return await asyncio.gather(*[converter.convert(html) for html in htmls])
+
+    assert asyncio.run(main()) == [markdownify(html, heading_style='atx') for html in htmls]
+
+
+def test_async_converter_outside_loop():
+    # created before the loop, and used in two loops, waiting for the limit
+    converter = AsyncConverter(limit=1, max_size=10)
+
+    async def main():
+        return await asyncio.gather(*[converter.convert(html) for html in ['<b>a</b>', '<i>b</i>']])
+
+    assert asyncio.run(main()) == ['**a**', '*b*']
+    assert asyncio.run(main()) == ['**a**', '*b*']
+    converter.close()
+
+
+def test_async_converter_file(tmp_path):
+    path = tmp_path / 'a.html'
+    path.write_bytes(b'<b>x</b>' * 10)
+
+    async def main():
+        async with AsyncConverter(max_size=80) as converter:
+            with open(str(path), 'rb') as f:
+                assert await converter.convert(f) == '**x**' * 10
+            # the size of file objects without a file descriptor, or reading
+            # a compressed file, is unknown
+            assert await converter.convert(io.BytesIO(b'x' * 81)) == 'x' * 81
+            with gzip.open(str(path) + '.gz', 'wb') as f:
+                f.write(b'x' * 81)
+            with gzip.open(str(path) + '.gz', 'rb') as f:
+                assert await converter.convert(f) == 'x' * 81
+        async with AsyncConverter(max_size=79) as converter:
+            with open(str(path), 'rb') as f:
+                with pytest.raises(ValueError):
+                    await converter.convert(f)
+                f.read(1)
+                assert await converter.convert(f) == markdownify((b'<b>x</b>' * 10)[1:])
+
+    asyncio.run(main())
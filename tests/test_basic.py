@@ -12,3 +12,7 @@ def test_soup():
 def test_whitespace():
     assert md(' a  b \t\t c ') == ' a b c '
     assert md(' a  b \n\n c ') == ' a b\nc '
+    assert md(' a b\r\nc ', wrap=True) == ' a b c '
+    assert md('a b <b>c d</b> e') == 'a b **c d** e'
+    assert md('<p> a b </p> c <hr> d <header> e </header>') == '\n\na b\n\nc \n\n---\n\n d  e '
+    assert md('<div> a <h7> b </h7> c </div>') == '\n\na\n\n###### b\n\nc\n\n'
@@ -0,0 +1,56 @@
+import pytest
+
+from markdownify import MarkdownConverter, markdownify
+from markdownify.batch import WorkerError, convert_many
+from .utils import UpperBoldConverter
+
+
+htmls = ['<b>%d</b>' % i for i in range(50)] + [None] + ['<p>last</p>']
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_convert_many(workers):
+    results = list(convert_many(htmls, workers=workers, chunksize=4))
+    assert [index for index, _ in results] == list(range(len(htmls)))
+    assert [result for _, result in results[:50]] == [markdownify(html) for html in htmls[:50]]
+    assert isinstance(results[50][1], TypeError)
+    assert results[51][1] == 'last'
+
+
+def test_convert_many_unordered():
+    results = dict(convert_many(htmls, workers=2, chunksize=4, ordered=False))
+    assert sorted(results) == list(range(len(htmls)))
+    assert results[7] == '**7**'
+
+
+def test_convert_many_options():
+    results = list(convert_many(['<b>x</b> <h1>y</h1>'], workers=2, converter_class=UpperBoldConverter, heading_style='atx'))
+    assert results == [(0, 'X\n\n# y')]
+    with pytest.raises(ValueError):
+        list(convert_many(htmls, strip=['a'], convert=['b']))
+
+
+class ContextError(Exception):
+    # (unpickled by calling ContextError(message), without the context)
+    def __init__(self, message, context):
+        super().__init__(message)
+        self.context = context
+
+
+class ItalicErrorConverter(MarkdownConverter):
+    def convert_i(self, el, text, parent_tags):
+        raise ContextError('no italics', el.name)
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_convert_many_unpicklable_error(workers):
+    results = list(convert_many(['<b>a</b>', '<i>b</i>', '<b>c</b>'], workers=workers,
+                                converter_class=ItalicErrorConverter))
+    assert [results[0], results[2]] == [(0, '**a**'), (2, '**c**')]
+    error = results[1][1]
+    if workers == 1:
+        assert isinstance(error, ContextError)
+    else:
+        assert isinstance(error, WorkerError)
+        assert str(error) == 'ContextError: no italics'
+        assert 'convert_i' in error.traceback
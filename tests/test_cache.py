@@ -0,0 +1,146 @@
+import functools
+import os
+import subprocess
+import sys
+import types
+
+import pytest
+from bs4 import BeautifulSoup
+
+from markdownify import MarkdownConverter, markdownify
+from markdownify.cache import CachedConverter, SqliteStore, fingerprint
+from .utils import UpperBoldConverter
+
+
+def test_cached_converter():
+    cached = CachedConverter(MarkdownConverter(), maxsize=2)
+    for html in ['<b>a</b>', '<b>b</b>', '<b>a</b>', '<b>c</b>', '<b>b</b>', '<b>a</b>']:
+        assert cached.convert(html) == markdownify(html)
+    # a, b, a hit, c evicts b, b evicts a, a
+    assert cached.cache_info() == (1, 0, 5, 2, 2)
+
+    soup = BeautifulSoup('<b>a</b>', 'html.parser')
+    assert cached.convert_soup(soup) == cached.convert_soup(soup) == '**a**'
+    assert cached.cache_info().hits == 2
+
+    cached.cache_clear()
+    assert cached.cache_info() == (0, 0, 0, 2, 0)
+
+
+def test_fingerprint():
+    assert fingerprint(MarkdownConverter()) == fingerprint(MarkdownConverter())
+    assert fingerprint(MarkdownConverter()) != fingerprint(MarkdownConverter(bullets='-'))
+    assert fingerprint(MarkdownConverter()) != fingerprint(UpperBoldConverter())
+    assert fingerprint(MarkdownConverter(code_language_callback=lambda el: 'a')) != fingerprint(MarkdownConverter(code_language_callback=lambda el: 'b'))
+
+
+CONVERTER_MODULE = """
+import re
+from markdownify import MarkdownConverter, abstract_inline_conversion
+
+re_exclamation = re.compile(%r)
+
+
+class ExclaimConverter(MarkdownConverter):
+    convert_b = abstract_inline_conversion(lambda self: %r)
+
+    def process_text(self, el, parent_tags=None):
+        return re_exclamation.sub('!', super().process_text(el, parent_tags=parent_tags))
+"""
+
+
+def exclaim_converter(monkeypatch, pattern, symbol):
+    # a version of the module tests.exclaim, as loaded by a process
+    module = types.ModuleType('tests.exclaim')
+    monkeypatch.setitem(sys.modules, module.__name__, module)
+    exec(CONVERTER_MODULE % (pattern, symbol), vars(module))
+    converter = module.ExclaimConverter()
+    return converter.convert('<b>x</b> abc'), fingerprint(converter)
+
+
+def test_fingerprint_versions(monkeypatch):
+    results = [exclaim_converter(monkeypatch, pattern, symbol)
+               for pattern, symbol in [('a', '**'), ('a', '**'), ('b', '**'), ('a', '__')]]
+    assert [markdown for markdown, _ in results] == ['**x** !bc', '**x** !bc', '**x** a!c', '__x__ !bc']
+    fingerprints = [f for _, f in results]
+    assert fingerprints[0] == fingerprints[1]
+    assert len(set(fingerprints)) == 3
+
+
+def language(prefix, el, suffix=''):
+    return prefix + suffix
+
+
+def language_factory(prefix):
+    def language(el):
+        return prefix
+    return language
+
+
+def default_factory(prefix):
+    def language(el, prefix=prefix):
+        return prefix
+    return language
+
+
+class Languages(object):
+    def __init__(self, prefix):
+        self.prefix = prefix
+
+    def __repr__(self):
+        return 'Languages(%r)' % self.prefix
+
+    def language(self, el):
+        return self.prefix
+
+
+def test_fingerprint_callables():
+    def fingerprints(*callbacks):
+        return set(fingerprint(MarkdownConverter(code_language_callback=c)) for c in callbacks)
+
+    assert len(fingerprints(functools.partial(language, 'py'), functools.partial(language, 'js'),
+                            functools.partial(language, 'py', suffix='3'))) == 3
+    assert len(fingerprints(functools.partial(language, 'py'), functools.partial(language, 'py'))) == 1
+    assert len(fingerprints(language_factory('py'), language_factory('js'))) == 2
+    assert len(fingerprints(language_factory('py'), language_factory('py'))) == 1
+    assert len(fingerprints(Languages('py').language, Languages('js').language)) == 2
+    assert len(fingerprints(default_factory('py'), default_factory('js'))) == 2
+
+    # a callable object has no canonical representation
+    class Callable(object):
+        def __call__(self, el):
+            return 'py'
+    with pytest.raises(TypeError):
+        fingerprint(MarkdownConverter(code_language_callback=Callable()))
+    with pytest.raises(TypeError):
+        CachedConverter(MarkdownConverter(code_language_callback=Callable()))
+
+
+def test_fingerprint_across_processes():
+    # the fingerprints of a store shared by processes must not depend on hash randomization
+    code = 'from markdownify import MarkdownConverter; from markdownify.cache import fingerprint; print(fingerprint(MarkdownConverter(strip={"a", "b", "c"})))'
+    fingerprints = set(
+        subprocess.check_output([sys.executable, '-c', code], env=dict(os.environ, PYTHONHASHSEED=seed))
+        for seed in ('1', '2', '3'))
+    assert len(fingerprints) == 1
+
+
+def test_sqlite_store(tmp_path):
+    path = str(tmp_path / 'cache.sqlite')
+    store = SqliteStore(path)
+    cached = CachedConverter(MarkdownConverter(), store=store)
+    assert cached.convert('<b>x</b>') == '**x**'
+    assert len(store) == 1
+
+    # a new cache with the same store finds the result; other converters do not
+    cached = CachedConverter(MarkdownConverter(), store=store)
+    assert cached.convert('<b>x</b>') == '**x**'
+    assert cached.cache_info()[:3] == (0, 1, 0)
+    assert CachedConverter(UpperBoldConverter(), store=store).convert('<b>x</b>') == 'X'
+    assert CachedConverter(MarkdownConverter(strong_em_symbol='_'), store=store).convert('<b>x</b>') == '__x__'
+    assert len(store) == 3
+    store.close()
+
+    store = SqliteStore(path)
+    assert len(store) == 3
+    store.close()
@@ -0,0 +1,68 @@
+"""
+Test conversion of HTML fed in chunks.
+
+"""
+import pytest
+
+from markdownify import MarkdownConverter, LSTRIP, RSTRIP, STRIP
+from markdownify.stream import iter_convert_chunks
+from .test_streaming import documents
+from .utils import FooterConverter, NoNavConverter, PrefixConverter, UpperConverter
+
+
+documents = documents + [
+    '<html><head><title>t</title></head><body>\n<p>one</p>\n<article><p>a</p> b </article>\n</body></html>\n',
+    '<div>\n<div> a </div>\n<section></section><div>\n\n</div></div><td><div>inline</div></td>',
+    '<ul><li>a</li></ul> \n <p>b</p><ol><li>c</li></ol>text<li>d</li><li>e</li>',
+    '<thead><tr><th>h</th></tr></thead><tbody><tr><td>a</td></tr></tbody><tr><td>b</td></tr>',
+    '<tbody><tr><td>a</td></tr></tbody><div><thead><tr><td>h</td></tr></thead></div>',
+    '<body><pre>a\n\n<div> b </div>\n</pre><script>x = "</p>";</script>&amp;&lt;&#169;</body>',
+]
+
+
+def chunks(html, size):
+    return (html[start:start + size] for start in range(0, len(html), size))
+
+
+@pytest.mark.parametrize('size', [1, 3, 1000])
+@pytest.mark.parametrize('options', [{}, {'strip_document': None, 'heading_style': 'atx'},
+                                     {'strip_document': LSTRIP, 'strip': ['div']},
+                                     {'strip_document': RSTRIP, 'wrap': True, 'wrap_width': 5},
+                                     {'strip_document': STRIP, 'table_infer_header': True}])
+@pytest.mark.parametrize('html', documents)
+def test_iter_convert_chunks(html, options, size):
+    converter = MarkdownConverter(**options)
+    assert ''.join(iter_convert_chunks(converter, chunks(html, size))) == converter.convert(html)
+
+
+def test_iter_convert_chunks_incremental():
+    read = []
+
+    def paragraphs():
+        yield '<html><body>'
+        for i in range(100):
+            read.append(i)
+            yield '<p>%d</p>' % i
+        yield '</body></html>'
+
+    pieces = iter_convert_chunks(MarkdownConverter(), paragraphs())
+    assert next(pieces) == '0'
+    assert len(read) == 1
+    assert ''.join(pieces).split() == [str(i) for i in range(1, 100)]
+
+
+def test_iter_convert_chunks_whole():
+    html = '<div><p><b>x</b></p></div>'
+    assert ''.join(iter_convert_chunks(UpperConverter(), chunks(html, 2))) == '**X**'
+
+
+@pytest.mark.parametrize('converter_class', [FooterConverter, NoNavConverter, PrefixConverter])
+def test_iter_convert_chunks_overrides(converter_class):
+    html = '<nav>menu</nav><p>x</p><p>y</p>'
+    converter = converter_class()
+    assert ''.join(iter_convert_chunks(converter, chunks(html, 3))) == converter.convert(html)
+
+
+def test_iter_convert_chunks_parser():
+    with pytest.raises(ValueError):
+        list(iter_convert_chunks(MarkdownConverter(parser='lxml'), ['<p>x</p>']))
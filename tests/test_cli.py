@@ -0,0 +1,197 @@
+import gzip
+import os
+import sys
+from io import StringIO
+
+import pytest
+
+from markdownify.main import main
+
+
+def run(argv, monkeypatch, stdin=''):
+    monkeypatch.setattr(sys, 'stdin', StringIO(stdin))
+    try:
+        main(argv)
+    except SystemExit as e:
+        return e.code
+    return 0
+
+
+def write(path, text):
+    os.makedirs(os.path.dirname(str(path)), exist_ok=True)
+    with open(str(path), 'w') as f:
+        f.write(text)
+
+
+def read(path):
+    with open(str(path)) as f:
+        return f.read()
+
+
+def test_stdin_stdout(monkeypatch, capsys):
+    assert run(['--heading-style', 'atx'], monkeypatch, stdin='<h1>x</h1>') == 0
+    assert capsys.readouterr().out == '# x\n'
+
+
+def test_file_stdout(tmp_path, monkeypatch, capsys):
+    write(tmp_path / 'a.html', '<b>a</b>')
+    assert run([str(tmp_path / 'a.html')], monkeypatch) == 0
+    assert capsys.readouterr().out == '**a**\n'
+
+
+def test_encoded_file(tmp_path, monkeypatch, capsys):
+    latin1 = '<meta charset="iso-8859-1"><b>caf\xe9</b>'.encode('latin-1')
+    (tmp_path / 'a.html').write_bytes(latin1)
+    (tmp_path / 'b.html').write_bytes('<b>\u20ac</b>'.encode('utf-16'))
+    assert run([str(tmp_path / 'a.html')], monkeypatch) == 0
+    assert run([str(tmp_path / 'b.html')], monkeypatch) == 0
+    assert capsys.readouterr().out == '**caf\xe9**\n**\u20ac**\n'
+    assert run([str(tmp_path / 'a.html'), str(tmp_path / 'b.html'), '--suffix', '.md'], monkeypatch) == 0
+    assert (tmp_path / 'a.md').read_bytes() == '**caf\xe9**'.encode('utf-8')
+    assert run([str(tmp_path / 'a.html'), str(tmp_path / 'b.html'), '--suffix', '.md',
+                '--output-encoding', 'utf-16'], monkeypatch) == 0
+    assert (tmp_path / 'a.md').read_bytes() == '**caf\xe9**'.encode('utf-16')
+    assert run([str(tmp_path / 'a.html'), str(tmp_path / 'b.html'), '--suffix', '.md',
+                '--output-encoding', 'ascii'], monkeypatch) == 1
+    assert 'a.md' in capsys.readouterr().err
+
+
+@pytest.mark.parametrize('jobs', ['1', '2'])
+def test_directory(tmp_path, monkeypatch, capsys, jobs):
+    write(tmp_path / 'in' / 'a.html', '<b>a</b>')
+    write(tmp_path / 'in' / 'sub' / 'b.htm', '<i>b</i>')
+    write(tmp_path / 'in' / 'c.txt', 'c')
+    assert run([str(tmp_path / 'in'), '--output-dir', str(tmp_path / 'out'), '-j', jobs], monkeypatch) == 0
+    assert read(tmp_path / 'out' / 'a.md') == '**a**'
+    assert read(tmp_path / 'out' / 'sub' / 'b.md') == '*b*'
+    assert sorted(os.listdir(str(tmp_path / 'out'))) == ['a.md', 'sub']
+    assert 'converted 2 files' in capsys.readouterr().err
+
+
+def test_glob_suffix_update(tmp_path, monkeypatch, capsys):
+    write(tmp_path / 'a.html', '<b>a</b>')
+    write(tmp_path / 'b.html', '<i>b</i>')
+    assert run([str(tmp_path / '*.html'), '--suffix', '.txt'], monkeypatch) == 0
+    assert read(tmp_path / 'a.txt') == '**a**'
+    assert read(tmp_path / 'b.txt') == '*b*'
+    capsys.readouterr()
+
+    # up-to-date files are skipped
+    mtime = os.path.getmtime(str(tmp_path / 'a.txt'))
+    os.utime(str(tmp_path / 'a.html'), (mtime + 10, mtime + 10))
+    assert run([str(tmp_path / 'a.html'), str(tmp_path / 'b.html'), '--suffix', '.txt', '-u'], monkeypatch) == 0
+    err = capsys.readouterr().err
+    assert 'converted 1 files' in err and '1 skipped' in err
+
+
+def test_glob_output_dir(tmp_path, monkeypatch, capsys):
+    write(tmp_path / 'site' / 'a' / 'index.html', '<b>a</b>')
+    write(tmp_path / 'site' / 'b' / 'index.html', '<i>b</i>')
+    assert run([str(tmp_path / 'site' / '**' / '*.html'), '--output-dir', str(tmp_path / 'out')], monkeypatch) == 0
+    assert read(tmp_path / 'out' / 'a' / 'index.md') == '**a**'
+    assert read(tmp_path / 'out' / 'b' / 'index.md') == '*b*'
+    capsys.readouterr()
+
+    # files converted to the same Markdown file
+    write(tmp_path / 'site' / 'a' / 'index.htm', '<b>c</b>')
+    assert run([str(tmp_path / 'site' / 'a'), '--output-dir', str(tmp_path / 'out')], monkeypatch) == 1
+    assert read(tmp_path / 'out' / 'index.md') == '**c**'
+    err = capsys.readouterr().err
+    assert 'index.md' in err and 'converted 1 files' in err and '1 failed' in err
+
+
+def test_unreadable_file(tmp_path, monkeypatch, capsys):
+    import markdownify.main
+
+    def read_bytes(path):
+        if path.endswith('a.html'):
+            raise PermissionError('Permission denied')
+        with open(path, 'rb') as f:
+            return f.read()
+    monkeypatch.setattr(markdownify.main, '_read', read_bytes)
+    write(tmp_path / 'a.html', '<b>a</b>')
+    write(tmp_path / 'b.html', '<b>b</b>')
+    assert run([str(tmp_path / 'a.html'), str(tmp_path / 'b.html'), '--suffix', '.md'], monkeypatch) == 1
+    assert not os.path.exists(str(tmp_path / 'a.md'))
+    assert read(tmp_path / 'b.md') == '**b**'
+    err = capsys.readouterr().err
+    assert 'Permission denied' in err and 'converted 1 files' in err and '1 failed' in err
+
+
+def test_missing_file(tmp_path, monkeypatch, capsys):
+    write(tmp_path / 'a.html', '<b>a</b>')
+    assert run([str(tmp_path / 'a.html'), str(tmp_path / 'missing.html'), '--suffix', '.md'], monkeypatch) == 1
+    assert read(tmp_path / 'a.md') == '**a**'
+    assert 'missing.html' in capsys.readouterr().err
+
+    assert run([str(tmp_path / 'missing.html')], monkeypatch) == 2
+    assert "can't open" in capsys.readouterr().err
+
+
+def test_unwritable_file(tmp_path, monkeypatch, capsys):
+    write(tmp_path / 'a.html', '<b>a</b>')
+    write(tmp_path / 'b.html', '<b>b</b>')
+    os.mkdir(str(tmp_path / 'a.md'))
+    assert run([str(tmp_path / 'a.html'), str(tmp_path / 'b.html'), '--suffix', '.md'], monkeypatch) == 1
+    assert read(tmp_path / 'b.md') == '**b**'
+    err = capsys.readouterr().err
+    assert 'a.md' in err and 'converted 1 files' in err and '1 failed' in err
+
+
+def test_profile(tmp_path, monkeypatch, capsys):
+    assert run(['--profile'], monkeypatch, stdin='<p>a <b>b</b></p>') == 0
+    out, err = capsys.readouterr()
+    assert out == 'a **b**\n'
+    assert 'convert_b' in err and 'documents 1,' in err
+
+    write(tmp_path / 'a.html', '<b>a</b>')
+    write(tmp_path / 'b.html', '<i>b</i>')
+    assert run([str(tmp_path / '*.html'), '--profile', '-j', '2'], monkeypatch) == 0
+    err = capsys.readouterr().err
+    assert 'convert_b' in err and 'convert_i' in err and 'documents 2,' in err
+
+
+def test_output(tmp_path, monkeypatch, capsysbinary):
+    html = '<h1>caf\xe9</h1><p>a<br>b</p>'
+    expected = 'caf\xe9\n====\n\na  \nb\n'
+    assert run(['-o', str(tmp_path / 'a.md')], monkeypatch, stdin=html) == 0
+    assert (tmp_path / 'a.md').read_bytes() == expected.encode('utf-8')
+    assert run(['--output', str(tmp_path / 'a.md.gz'), '--stream'], monkeypatch, stdin=html) == 0
+    with gzip.open(str(tmp_path / 'a.md.gz')) as f:
+        assert f.read() == expected.encode('utf-8')
+    assert run(['-o', str(tmp_path / 'b.md'), '--output-encoding', 'utf-16'], monkeypatch, stdin=html) == 0
+    assert (tmp_path / 'b.md').read_bytes() == expected.encode('utf-16')
+    assert run(['--output-encoding', 'latin-1'], monkeypatch, stdin=html) == 0
+    assert capsysbinary.readouterr().out == expected.encode('latin-1')
+
+    write(tmp_path / 'c.html', html)
+    assert run([str(tmp_path / 'c.html'), str(tmp_path / 'c.html'), '-o', str(tmp_path / 'c.md')], monkeypatch) == 2
+
+
+def test_output_zstd(tmp_path, monkeypatch, capsys):
+    try:
+        from compression import zstd
+    except ImportError:
+        try:
+            import zstandard as zstd
+        except ImportError:
+            zstd = None
+    path = str(tmp_path / 'a.md.zst')
+    if zstd is None:
+        assert run(['-o', path], monkeypatch, stdin='<b>a</b>') == 2
+        assert 'zstandard' in capsys.readouterr().err
+        return
+    assert run(['-o', path], monkeypatch, stdin='<b>a</b>') == 0
+    with zstd.open(path, 'rb') as f:
+        assert f.read() == b'**a**\n'
+
+
+def test_stream(tmp_path, monkeypatch, capsys):
+    html = '<html><body>' + '<p>a <b>b</b></p>' * 3 + '</body></html>'
+    assert run(['--stream'], monkeypatch, stdin=html) == 0
+    assert capsys.readouterr().out == 'a **b**\n\na **b**\n\na **b**\n'
+
+    write(tmp_path / 'a.html', html)
+    assert run([str(tmp_path / 'a.html'), '--stream', '--heading-style', 'atx'], monkeypatch) == 0
+    assert capsys.readouterr().out == 'a **b**\n\na **b**\n\na **b**\n'
+    assert run(['--stream', '--parser', 'lxml'], monkeypatch) == 2
@@ -26,7 +26,105 @@ def test_custom_conversion_functions():
     assert md("<custom-tag>text</custom-tag>") == "FUNCTION USED: text"
 
 
+class TracingConverter(MarkdownConverter):
+    """
+    Create a custom MarkdownConverter that overrides process_element
+    """
+    def process_element(self, node, parent_tags=None):
+        text = super().process_element(node, parent_tags=parent_tags)
+        return '(%s)' % text if node.name == 'b' else text
+
+
+def test_process_element_override():
+    assert TracingConverter().convert('<p><i>a <b>b</b></i></p>') == '*a (**b**)*'
+
+
+class ParentTagsConverter(MarkdownConverter):
+    """
+    Create a custom MarkdownConverter that records the parent tags of <b>
+    """
+    def __init__(self, **options):
+        super().__init__(**options)
+        self.all_seen = []
+
+    def convert_b(self, el, text, parent_tags):
+        self.seen = parent_tags
+        self.all_seen.append(parent_tags)
+        return super().convert_b(el, text, parent_tags)
+
+
+def test_parent_tags_set_like():
+    converter = ParentTagsConverter()
+    converter.convert('<h1><i>a <b>b</b></i></h1>')
+    assert converter.seen == {'[document]', 'h1', '_inline', 'i'}
+    assert 'i' in converter.seen and 'p' not in converter.seen
+    assert set(converter.seen) | {'p'} == converter.seen | {'p'}
+    assert len(converter.seen) == 4
+    # the methods of sets, as when parent_tags was a set
+    assert isinstance(converter.seen, set)
+    copy = converter.seen.copy()
+    copy.add('p')
+    assert 'p' not in converter.seen and type(copy) is set
+    assert converter.seen.union(['p']) == copy
+    assert converter.seen.issubset(copy) and copy.issuperset(converter.seen)
+    assert converter.seen.intersection({'i', 'p'}) == {'i'}
+
+
+class AddingConverter(MarkdownConverter):
+    def convert_b(self, el, text, parent_tags):
+        parent_tags.add('_seen_b')
+        return super().convert_b(el, text, parent_tags)
+
+
+def test_parent_tags_add():
+    assert AddingConverter().convert('<p><b>a</b> <b>b</b></p>') == '**a** **b**'
+
+
+def test_parent_tags_shared():
+    converter = ParentTagsConverter()
+    converter.convert('<p><i><b>a</b></i></p><p><i><b>b</b></i></p><div><i><b>c</b></i></div>')
+    first, second, third = converter.all_seen
+    assert first is not second
+    assert first.names is second.names
+    assert third.names == {'[document]', 'div', 'i'}
+
+
+def test_process_tag_inside_pre():
+    # newlines are not collapsed inside <pre>, even above the converted tag
+    soup = BeautifulSoup('<pre><span><p>a</p><p>b</p></span></pre>', 'html.parser')
+    assert MarkdownConverter().process_tag(soup.span) == '\n\na\n\n\n\nb\n\n'
+
+
 def test_soup():
     html = '<b>test</b>'
     soup = BeautifulSoup(html, 'html.parser')
     assert MarkdownConverter().convert_soup(soup) == '**test**'
+
+
+class OptionsConverter(MarkdownConverter):
+    """
+    Create a custom MarkdownConverter with its own default options
+    """
+    class Options(MarkdownConverter.DefaultOptions):
+        bullets = '-'
+        heading_style = 'atx'
+
+
+def test_class_options():
+    html = '<h1>T</h1><ul><li>a</li></ul>'
+    assert OptionsConverter().convert(html) == '# T\n\n- a'
+    assert OptionsConverter(bullets='+').convert(html) == '# T\n\n+ a'
+    assert OptionsConverter().options['bullets'] == '-'
+    assert MarkdownConverter().convert(html) == 'T\n=\n\n* a'
+
+
+def test_class_options_changed(monkeypatch):
+    html = '<h1>T</h1><ul><li>a</li></ul>'
+    assert MarkdownConverter().convert(html) == 'T\n=\n\n* a'
+    monkeypatch.setattr(MarkdownConverter.DefaultOptions, 'bullets', '+')
+    assert MarkdownConverter().convert(html) == 'T\n=\n\n+ a'
+    assert OptionsConverter().convert(html) == '# T\n\n- a'
+    monkeypatch.setattr(OptionsConverter.Options, 'heading_style', 'atx_closed')
+    assert OptionsConverter().convert(html) == '# T #\n\n- a'
+    monkeypatch.undo()
+    assert MarkdownConverter().convert(html) == 'T\n=\n\n* a'
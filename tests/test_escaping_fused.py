@@ -0,0 +1,51 @@
+"""
+Test the single-pass escaping against applying each escape in turn.
+
+"""
+import pytest
+
+from markdownify import MarkdownConverter, re_escape_misc_chars, \
+    re_escape_misc_dash_sequences, re_escape_misc_hashes, re_escape_misc_list_items
+
+hypothesis = pytest.importorskip('hypothesis')
+st = hypothesis.strategies
+
+
+def escape_in_turn(text, escape_misc, escape_asterisks, escape_underscores):
+    if escape_misc:
+        text = re_escape_misc_chars.sub(r'\\\1', text)
+        text = re_escape_misc_dash_sequences.sub(r'\1\\\2', text)
+        text = re_escape_misc_hashes.sub(r'\1\\\2', text)
+        text = re_escape_misc_list_items.sub(r'\1\\\2', text)
+    if escape_asterisks:
+        text = text.replace('*', r'\*')
+    if escape_underscores:
+        text = text.replace('_', r'\_')
+    return text
+
+
+# Fragments that exercise the escapes and their interaction
+fragments = st.sampled_from([
+    '-', '--', '#', '##', '#######', '1', '23', '1234567890', '.', ')',
+    ' ', '  ', '\n', '\t', '\xa0', 'a', 'word', '*', '_', '\\',
+    '[', ']', '&', '<', '>', '`', '~', '=', '+', '|',
+    '- ', '# ', '1. ', '2) ',
+])
+texts = st.one_of(st.text(), st.lists(fragments, max_size=20).map(''.join))
+
+
+@hypothesis.settings(max_examples=500)
+@hypothesis.given(texts, st.booleans(), st.booleans(), st.booleans())
+def test_escape(text, escape_misc, escape_asterisks, escape_underscores):
+    converter = MarkdownConverter(escape_misc=escape_misc,
+                                  escape_asterisks=escape_asterisks,
+                                  escape_underscores=escape_underscores)
+    assert converter.escape(text, set()) == escape_in_turn(text, escape_misc, escape_asterisks, escape_underscores)
+
+
+def test_escape_sequences():
+    # a sequence directly following an escaped one is not escaped
+    assert MarkdownConverter(escape_misc=True).escape('- - - -', set()) == r'\- - \- -'
+    assert MarkdownConverter(escape_misc=True).escape('# # x', set()) == r'\# # x'
+    assert MarkdownConverter(escape_misc=True).escape('1. 2. x', set()) == r'1\. 2. x'
+    assert MarkdownConverter(escape_misc=True).escape('-  - # 1. x', set()) == r'\-  \- \# 1\. x'
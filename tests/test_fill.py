@@ -0,0 +1,39 @@
+"""
+Test the paragraph wrapping against textwrap.fill.
+
+"""
+import textwrap
+
+import pytest
+
+from markdownify import _fill
+from .utils import md
+
+hypothesis = pytest.importorskip('hypothesis')
+st = hypothesis.strategies
+
+
+# Fragments that exercise the line breaking
+fragments = st.sampled_from([
+    'a', 'word', 'longerword', ' ', '  ', '\t', '\n', '\r', '\x0b', '\x0c',
+    '\xa0', '　', '-', 'a-b', '[link](http://example.com/a/long/path)',
+    '`code span`', 'é',
+])
+texts = st.one_of(st.text(), st.lists(fragments, max_size=30).map(''.join))
+
+
+@hypothesis.settings(max_examples=1000)
+@hypothesis.given(texts, st.integers(min_value=1, max_value=40))
+def test_fill(text, width):
+    assert _fill(text, width) == textwrap.fill(text, width=width, break_long_words=False,
+                                               break_on_hyphens=False)
+
+
+def test_fill_invalid_width():
+    with pytest.raises(ValueError):
+        _fill('text', 0)
+
+
+def test_wrap_tokens():
+    html = '<p>see <a href="http://example.com/a/very/long/path/to/a/page">the page</a> and <code>call_it()</code> now</p>'
+    assert md(html, wrap=True, wrap_width=20) == '\n\nsee [the\npage](http://example.com/a/very/long/path/to/a/page)\nand `call_it()` now\n\n'
@@ -0,0 +1,16 @@
+import subprocess
+import sys
+
+import markdownify
+
+
+def test_lazy_bs4_import():
+    code = 'import sys, markdownify; print("bs4" in sys.modules)'
+    output = subprocess.check_output([sys.executable, '-c', code]).decode().strip()
+    assert output == 'False'
+
+
+def test_bs4_names():
+    from bs4 import Tag
+    assert markdownify.Tag is Tag
+    assert not hasattr(markdownify, 'Unknown')
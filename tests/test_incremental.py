@@ -0,0 +1,56 @@
+import pytest
+
+from markdownify import MarkdownConverter
+from markdownify.incremental import ConvertedDocument
+from .utils import CountingConverter, FooterConverter, NoNavConverter, PrefixConverter, UpperConverter
+
+
+versions = [
+    '<p>a <b>b</b></p> <p>c <b>d</b></p>',
+    '<p>a <b>b</b></p> <p>c <b>e</b></p>\n<h1>x</h1>',
+    '<h1>x</h1><p>a <b>b</b></p>',
+    '<html><body><ul><li>a <b>b</b></li><li>c</li></ul><ol><li>d</li></ol></body></html>',
+    '<html><body><ul><li>c</li><li>a <b>b</b></li></ul>text<ol><li>d</li></ol></body></html>',
+    '<table><tr><td><b>x</b></td></tr><tr><td>y</td></tr></table>',
+    '<table><tr><td>y</td></tr><tr><td><b>x</b></td></tr></table>',
+    '<pre><span>a\n\nb</span></pre><span>a\n\nb</span>',
+    '<span>a\n\nb</span><pre><span>a\n\nb</span></pre>',
+    '',
+    'just text',
+]
+
+
+@pytest.mark.parametrize('options', [{}, {'heading_style': 'atx', 'strip_document': None, 'memoize_subtrees': True}])
+def test_update_matches_convert(options):
+    converter = MarkdownConverter(**options)
+    document = ConvertedDocument(converter, versions[0])
+    assert document.markdown == converter.convert(versions[0])
+    for html in versions[1:] + versions:
+        assert document.update(html) == document.markdown == converter.convert(html)
+
+
+def test_update_reuses_subtrees():
+    converter = CountingConverter()
+    paragraphs = ['<p>%d <b>b</b></p>' % i for i in range(10)]
+    document = ConvertedDocument(converter, '<article>%s</article>' % ''.join(paragraphs))
+    assert converter.count == 10
+
+    paragraphs[4] = '<p>4 <b>c</b></p>'
+    html = '<article>%s</article>' % ''.join(paragraphs)
+    assert document.update(html) == MarkdownConverter().convert(html)
+    assert converter.count == 11
+
+
+def test_update_override():
+    converter = UpperConverter()
+    document = ConvertedDocument(converter, '<p><b>x</b></p>')
+    assert document.update('<p><b>x</b></p><p>y</p>') == '**X**\n\nY'
+
+
+@pytest.mark.parametrize('converter_class', [FooterConverter, NoNavConverter, PrefixConverter])
+def test_update_overrides(converter_class):
+    converter = converter_class()
+    document = ConvertedDocument(converter, '<nav>menu</nav><p>a</p>')
+    assert document.markdown == converter.convert('<nav>menu</nav><p>a</p>')
+    for html in versions:
+        assert document.update(html) == converter.convert(html)
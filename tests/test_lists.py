@@ -1,3 +1,5 @@
+from bs4 import BeautifulSoup
+from markdownify import MarkdownConverter
 from .utils import md
 
 
@@ -87,3 +89,17 @@ def test_bullets():
 
 def test_li_text():
     assert md('<ul><li>foo <a href="#">bar</a></li><li>foo bar  </li><li>foo <b>bar</b>   <i>space</i>.</ul>') == '\n\n* foo [bar](#)\n* foo bar\n* foo **bar** *space*.\n'
+
+
+def test_long_ol():
+    html = '<ol start="5">' + ''.join('<li>%d</li>' % i for i in range(1000)) + '</ol>'
+    assert md(html) == '\n\n' + ''.join('%d. %d\n' % (i + 5, i) for i in range(1000))
+
+
+def test_li_outside_traversal():
+    # convert_li() called directly, without the context tracked by process_tag()
+    soup = BeautifulSoup('<ol><li>a</li><li>b</li></ol><ul><li><ul><li>c</li></ul></li></ul>', 'html.parser')
+    items = soup.find_all('li')
+    assert MarkdownConverter().convert_li(items[1], 'b', set()) == '2. b\n'
+    assert MarkdownConverter().convert_li(items[3], 'c', set()) == '+ c\n'
+    assert MarkdownConverter().process_tag(items[3]) == '+ c\n'
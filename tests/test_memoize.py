@@ -0,0 +1,37 @@
+import pytest
+
+from .utils import CountingConverter, UpperConverter, md
+
+
+card = '<div><h3>T</h3><p>a <b>b</b></p><img src="i.png" alt="i"></div>'
+
+repeated = [
+    card * 3,
+    '<ol>' + '<li>x <b>y</b></li>' * 3 + '</ol><ol start="4">' + '<li>x <b>y</b></li>' * 2 + '</ol>',
+    '<ul>' + '<li><ul><li>a</li><li>a</li></ul></li>' * 2 + '</ul><ul><li>a</li></ul>',
+    '<ul><li>a</li></ul>b<ul><li>a</li></ul><ul><li>a</li></ul>',
+    '<table><tr><td>x</td></tr><tr><td>x</td></tr></table>' * 2,
+    '<table><tbody><tr><td>x</td></tr></tbody><tbody><tr><td>x</td></tr></tbody></table>',
+    '<table><tr><td><b>x</b></td><td><b>x</b></td></tr></table><b>x</b>',
+    '<h1><img src="i.png" alt="i"></h1><p><img src="i.png" alt="i"></p><td><img src="i.png" alt="i"></td>',
+    '<pre><span>a\n\nb</span></pre><span>a\n\nb</span><pre><span>a\n\nb</span></pre>',
+    '<p>x</p><code><i>a_b</i></code><i>a_b</i><blockquote><i>a_b</i></blockquote>',
+]
+
+
+@pytest.mark.parametrize('html', repeated)
+@pytest.mark.parametrize('options', [{}, {'heading_style': 'atx', 'keep_inline_images_in': ['td']}])
+def test_memoize_subtrees(html, options):
+    assert md(html, memoize_subtrees=True, **options) == md(html, **options)
+
+
+def test_memoize_subtrees_override():
+    html = '<p><b>x</b></p>' * 3
+    converter = UpperConverter(memoize_subtrees=True)
+    assert converter.convert(html) == UpperConverter().convert(html) == '**X**\n\n**X**\n\n**X**'
+
+
+def test_memoize_subtrees_reused():
+    converter = CountingConverter(memoize_subtrees=True)
+    assert converter.convert(card * 3) == md(card * 3, strip_document='strip')
+    assert converter.count == 1
@@ -0,0 +1,178 @@
+"""
+Conformance of the conversion across parser backends.
+
+"""
+import bz2
+import gzip
+import io
+import lzma
+import mmap
+import xml.etree.ElementTree as ElementTree
+
+import pytest
+from bs4 import BeautifulSoup
+
+from markdownify import MarkdownConverter, soup_from_etree
+from markdownify.cache import CachedConverter
+from .utils import md
+
+
+def _available(parser):
+    try:
+        BeautifulSoup('', parser)
+    except Exception:
+        return False
+    return True
+
+
+PARSERS = [p for p in ('html.parser', 'lxml', 'html5lib') if _available(p)]
+
+# Markup that converts identically with every parser.
+CONFORMING = [
+    '<b>bold</b> and <em>em</em>',
+    '<p>a</p>\n<p>b</p>',
+    '<div><span>Hello</div></span>',
+    '<p>a<p>b',
+    '<ol start="3"><li>a</li><li>b</li></ol>',
+    '<ul><li>a<ul><li>b</li></ul></li></ul>',
+    '<table><tr><th>h</th></tr><tr><td>c</td></tr></table>',
+    '<pre> x\n y</pre>',
+    '<h1>T</h1><h3>U</h3>',
+    '<blockquote>q</blockquote>',
+    '<a href="http://example.com">link</a> &amp; a_b',
+    'a<br>b',
+    '<!DOCTYPE html><p>x</p>',
+]
+
+# Markup that converts differently, by parser. Missing parsers use the
+# html.parser result.
+DIFFERING = [
+    # lxml and html5lib drop leading whitespace before the implied <body>
+    (' lead', {'html.parser': ' lead', 'lxml': 'lead', 'html5lib': 'lead'}),
+    # html5lib drops the newline that starts a <pre> block
+    ('<pre>\ncode</pre>', {'html.parser': '\n\n```\n\ncode\n```\n\n',
+                           'html5lib': '\n\n```\ncode\n```\n\n'}),
+    # html.parser does not close <li> elements implicitly
+    ('<ul><li>a<li>b</ul>', {'html.parser': '\n\n* a* b\n',
+                             'lxml': '\n\n* a\n* b\n',
+                             'html5lib': '\n\n* a\n* b\n'}),
+    # lxml closes <b> before a block element
+    ('<b><p>x</p></b>', {'html.parser': '**x**', 'lxml': '\n\nx\n\n',
+                         'html5lib': '**x**'}),
+    # html5lib inserts an implied <tbody>
+    ('<table><td>x</td></table>', {'html.parser': '\n\nx |\n\n',
+                                   'html5lib': '\n\n|  |\n| --- |\n| x |\n\n'}),
+    # html5lib drops table rows outside of a <table>
+    ('<tr><td>x</td></tr>', {'html.parser': '|  |\n| --- |\n| x |\n',
+                             'html5lib': 'x'}),
+    # html.parser does not close <dt> and <dd> elements implicitly
+    ('<dl><dt>a<dd>b</dl>', {'html.parser': '\n\na: b\n\n',
+                             'lxml': '\n\na\n:   b\n\n',
+                             'html5lib': '\n\na\n:   b\n\n'}),
+]
+
+
+@pytest.mark.parametrize('parser', PARSERS)
+@pytest.mark.parametrize('html', CONFORMING)
+def test_conforming(parser, html):
+    assert md(html, parser=parser) == md(html)
+
+
+@pytest.mark.parametrize('parser', PARSERS)
+@pytest.mark.parametrize('html,expected', DIFFERING)
+def test_differing(parser, html, expected):
+    assert md(html, parser=parser) == expected.get(parser, expected['html.parser'])
+
+
+def test_parser_callable():
+    assert md('<b>x</b>', parser=lambda html: BeautifulSoup(html, 'html.parser')) == '**x**'
+    assert md('<p>a <b>x</b></p>b', parser=lambda html: ElementTree.fromstring('<div>%s</div>' % html)) == '\n\na **x**\n\nb\n\n'
+
+
+def test_soup_from_etree():
+    def convert(tree):
+        return MarkdownConverter(strip_document=None).convert_soup(soup_from_etree(tree))
+
+    tree = ElementTree.fromstring('<div><p class="a b">x<!-- comment --> y</p><ol><li>a</li><li>b</li></ol></div>')
+    assert convert(tree) == '\n\nx y\n\n1. a\n2. b\n\n'
+    assert convert(ElementTree.ElementTree(tree)) == convert(tree)
+    assert soup_from_etree(tree).p['class'] == ['a', 'b']
+
+    tree = ElementTree.fromstring('<html xmlns="http://www.w3.org/1999/xhtml"><body><h1>T</h1></body></html>')
+    assert convert(tree) == '\n\nT\n=\n\n'
+
+
+def test_soup_from_lxml():
+    html = pytest.importorskip('lxml.html')
+    markup = '<div><p>a <b>b</b> c</p><table><tr><th>h</th></tr><tr><td>c</td></tr></table></div>'
+    assert MarkdownConverter().convert_soup(soup_from_etree(html.fromstring(markup))) == md(markup, strip_document='strip')
+
+
+# Encoded documents, and the encoding sniffed from them.
+ENCODED = [
+    ('<p>caf\xe9 \u201cq\u201d \u20ac</p>'.encode('utf-8'), 'utf-8'),
+    ('<meta charset="iso-8859-1"><p>caf\xe9</p>'.encode('latin-1'), 'iso-8859-1'),
+    ('<p>caf\xe9</p>'.encode('utf-16'), 'utf-16le'),
+    ('<p>caf\xe9</p>'.encode('utf-8-sig'), 'utf-8'),
+    # not UTF-8: windows-1252
+    ('<p>caf\xe9 \u201cq\u201d</p>'.encode('cp1252') * 1000, 'windows-1252'),
+]
+
+
+@pytest.mark.parametrize('data,encoding', ENCODED, ids=[e for _, e in ENCODED])
+def test_bytes(data, encoding, tmp_path):
+    soup = BeautifulSoup(data, 'html.parser')
+    assert soup.original_encoding == encoding
+    expected = MarkdownConverter(strip_document=None).convert_soup(soup)
+    assert 'caf\xe9' in expected
+    assert md(data) == expected
+    assert md(bytearray(data)) == expected
+    assert md(memoryview(data)) == expected
+    assert md(io.BytesIO(data)) == expected
+
+    path = tmp_path / 'doc.html'
+    path.write_bytes(data)
+    with open(path, 'rb') as f:
+        assert md(f) == expected
+        f.seek(3)
+        assert md(f) == md(data[3:])
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        assert md(mapped) == expected
+
+
+@pytest.mark.parametrize('parser', PARSERS)
+def test_bytes_parsers(parser, tmp_path):
+    data = '<meta charset="iso-8859-1"><p>caf\xe9</p>'.encode('latin-1')
+    assert md(data, parser=parser) == md(data.decode('latin-1'), parser=parser)
+    path = tmp_path / 'doc.html'
+    path.write_bytes(data)
+    with open(path, 'rb') as f:
+        assert md(f, parser=parser) == md(data, parser=parser)
+
+
+@pytest.mark.parametrize('module', [gzip, bz2, lzma])
+def test_compressed_file(module, tmp_path):
+    # wrappers reading a compressed file, whose fileno() is not to be mapped
+    data = '<p>caf\xe9</p>'.encode('utf-8') * 100
+    path = tmp_path / 'doc.html.z'
+    with module.open(str(path), 'wb') as f:
+        f.write(data)
+    with module.open(str(path), 'rb') as f:
+        assert md(f) == md(data)
+
+
+def test_text_file(tmp_path):
+    path = tmp_path / 'doc.html'
+    path.write_text('<b>caf\xe9</b>', encoding='utf-8')
+    with open(path, encoding='utf-8') as f:
+        assert md(f) == '**caf\xe9**'
+    assert md(io.StringIO('<i>x</i>')) == '*x*'
+    assert md(b'') == ''
+
+
+def test_bytes_cached():
+    converter = CachedConverter(MarkdownConverter())
+    assert converter.convert(b'<b>x</b>') == '**x**'
+    assert converter.convert(io.BytesIO(b'<b>x</b>')) == '**x**'
+    assert converter.convert('<b>x</b>') == '**x**'
+    assert converter.cache_info().hits == 1
@@ -0,0 +1,101 @@
+import io
+import json
+import socket
+import sys
+import threading
+
+import pytest
+
+from markdownify import MarkdownConverter
+from markdownify.main import main
+from markdownify.serve import Client, ConverterPool, make_server, serve_stream
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, 'AF_UNIX'), reason='requires Unix sockets')
+
+
+def serve_lines(requests, **options):
+    rfile = io.BytesIO(b''.join(
+        (r if isinstance(r, bytes) else json.dumps(r).encode()) + b'\n' for r in requests))
+    wfile = io.BytesIO()
+    serve_stream(rfile, wfile, ConverterPool(**options))
+    return [json.loads(line) for line in wfile.getvalue().splitlines()]
+
+
+def test_serve_stream():
+    assert serve_lines([
+        {'id': 1, 'html': '<h1>x</h1>'},
+        {'id': 'b', 'html': '<h1>x</h1>', 'options': {'heading_style': 'underlined'}},
+        {'html': '<b>b</b>', 'options': {'strong_em_symbol': '_'}},
+    ], heading_style='atx') == [
+        {'id': 1, 'markdown': '# x'},
+        {'id': 'b', 'markdown': 'x\n='},
+        {'id': None, 'markdown': '__b__'},
+    ]
+
+
+def test_serve_stream_errors():
+    responses = serve_lines([
+        b'not json',
+        {'id': 1},
+        {'id': 2, 'html': 'x', 'options': {'strip': ['a'], 'convert': ['b']}},
+        b'{"id": 4, "html": "\xff"}',
+        {'id': 3, 'html': '<i>ok</i>'},
+    ])
+    assert [r['id'] for r in responses] == [None, 1, 2, None, 3]
+    assert all('error' in r for r in responses[:4])
+    assert 'html' in responses[1]['error']
+    assert 'UnicodeDecodeError' in responses[3]['error']
+    assert responses[4] == {'id': 3, 'markdown': '*ok*'}
+
+
+def test_converter_pool():
+    pool = ConverterPool(maxsize=2, bullets='-')
+    converter = pool.get()
+    assert pool.get({}) is converter
+    assert converter.options['bullets'] == '-'
+    assert pool.get({'bullets': '+'}).options['bullets'] == '+'
+    pool.get({'bullets': '*'})
+    assert pool.get() is not converter
+
+
+@pytest.fixture
+def server(tmp_path):
+    path = str(tmp_path / 'md.sock')
+    server = make_server(path, ConverterPool(MarkdownConverter, heading_style='atx'))
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    yield path
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+def test_client(server):
+    with Client(server) as client:
+        assert client.convert('<h1>x</h1>') == '# x'
+        assert client.convert('<h1>x</h1>', heading_style='atx_closed') == '# x #'
+        with pytest.raises(ValueError):
+            client.convert('x', strip=['a'], convert=['b'])
+    with pytest.raises(OSError):
+        make_server(server, ConverterPool())
+
+
+def test_cli_client(server, tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(sys, 'stdin', io.StringIO('<h2>x</h2>'))
+    main(['--socket', server, '--heading-style', 'atx_closed'])
+    assert capsys.readouterr().out == '## x ##\n'
+
+    # without a server, the document is converted locally
+    monkeypatch.setattr(sys, 'stdin', io.StringIO('<h2>x</h2>'))
+    main(['--socket', str(tmp_path / 'missing.sock')])
+    assert capsys.readouterr().out == 'x\n-\n'
+
+
+def test_cli_serve_stdin(monkeypatch, capsysbinary):
+    requests = b'{"id": 1, "html": "<b>a</b>"}\n{"id": 2, "html": "<h1>b</h1>"}\n'
+    monkeypatch.setattr(sys, 'stdin', io.TextIOWrapper(io.BytesIO(requests)))
+    with pytest.raises(SystemExit) as e:
+        main(['--serve', '--heading-style', 'atx'])
+    assert e.value.code == 0
+    assert capsysbinary.readouterr().out.splitlines() == [
+        b'{"id": 1, "markdown": "**a**"}', b'{"id": 2, "markdown": "# b"}']
@@ -0,0 +1,35 @@
+import pickle
+
+from markdownify import MarkdownConverter
+
+
+def test_stats():
+    converter = MarkdownConverter(profile=True)
+    html = '<h1>T</h1><p>a <b>b</b> <i>c</i> <em>d</em></p>'
+    for _ in range(3):
+        assert converter.convert(html) == MarkdownConverter().convert(html)
+    assert ''.join(converter.iter_convert(html)) == converter.convert(html)
+
+    stats = converter.stats
+    assert stats.phase_calls['parse'] == 5
+    assert stats.hook_calls['convert_b'] == 5
+    assert stats.hook_calls['convert_i'] == stats.hook_calls['convert_em'] == 5
+    assert stats.hook_calls['convert_h1'] == 5
+    assert len(stats.document_times) == 4  # not iter_convert()
+    assert set(stats.as_dict()['phases']) == {'parse', 'whitespace', 'text', 'escape', 'collapse and join'}
+    assert 'convert_h1' in stats.report()
+
+    stats.reset()
+    assert stats.as_dict()['documents']['count'] == 0
+
+
+def test_stats_disabled():
+    converter = MarkdownConverter()
+    assert converter.stats is None
+    assert 'escape' not in vars(converter)
+
+
+def test_stats_pickle():
+    converter = pickle.loads(pickle.dumps(MarkdownConverter(profile=True)))
+    assert converter.convert('<b>x</b>') == '**x**'
+    assert converter.stats.hook_calls['convert_b'] == 1
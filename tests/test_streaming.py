@@ -0,0 +1,96 @@
+"""
+Test conversion that yields the Markdown in pieces.
+
+"""
+import gzip
+import io
+
+import pytest
+from bs4 import BeautifulSoup
+
+from markdownify import MarkdownConverter, LSTRIP, RSTRIP, STRIP, convert_to
+from .utils import FooterConverter, NoNavConverter, PrefixConverter
+
+
+documents = [
+    '',
+    'text',
+    '<p>one</p><p>two</p>',
+    '\n\n<h1>Title</h1>\n<p>one</p>\ntext<br><ul><li>a</li></ul><hr><pre>  code\n</pre>  ',
+    '<br><br>text<br><br>',
+    '<div></div><p></p> <p>x</p>',
+    '<table><tr><td>a</td></tr></table><ol><li>a</li><li>b</li></ol>',
+    '<html><body>\n<div><p>a</p>b</div>\n<section><ul><li>c</li></ul></section><span><div>d</div></span></body></html>',
+]
+
+
+@pytest.mark.parametrize('strip_document', [LSTRIP, RSTRIP, STRIP, None])
+@pytest.mark.parametrize('html', documents)
+def test_iter_convert(html, strip_document):
+    converter = MarkdownConverter(strip_document=strip_document)
+    pieces = list(converter.iter_convert(html))
+    assert ''.join(pieces) == converter.convert(html)
+    assert '' not in pieces
+
+
+def test_iter_convert_pieces():
+    pieces = list(MarkdownConverter().iter_convert('<p>one</p><p>two</p><p>three</p>'))
+    assert pieces == ['one', '\n\ntwo', '\n\nthree']
+    # the blocks of tags without a conversion of their own, and of <div> tags
+    pieces = list(MarkdownConverter().iter_convert(
+        '<html><body><p>one</p><div><p>two</p><p>three</p></div></body></html>'))
+    assert pieces == ['one', '\n\ntwo', '\n\nthree']
+
+
+def test_iter_convert_options():
+    html = '<p>one</p><b>two</b>'
+    # without conversion of the document, strip_document does not apply
+    converter = MarkdownConverter(strip=['[document]'])
+    assert ''.join(converter.iter_convert(html)) == converter.convert(html) == '\n\none\n\n**two**'
+    converter = MarkdownConverter(convert=['p', 'b'])
+    assert ''.join(converter.iter_convert(html)) == converter.convert(html) == '\n\none\n\n**two**'
+    with pytest.raises(ValueError):
+        list(MarkdownConverter(strip_document='middle').iter_convert(html))
+
+
+class UpperDocumentConverter(MarkdownConverter):
+    def convert__document_(self, el, text, parent_tags):
+        return text.upper()
+
+
+def test_iter_convert_custom_document():
+    assert list(UpperDocumentConverter().iter_convert('<p>one</p><p>two</p>')) == ['\n\nONE\n\nTWO\n\n']
+
+
+@pytest.mark.parametrize('converter_class', [FooterConverter, NoNavConverter, PrefixConverter])
+def test_iter_convert_overrides(converter_class):
+    html = '<nav>menu</nav><p>x</p><p>y</p>'
+    converter = converter_class()
+    assert ''.join(converter.iter_convert(html)) == converter.convert(html)
+    sink = io.StringIO()
+    converter.convert_to(html, sink)
+    assert sink.getvalue() == converter.convert(html)
+    assert NoNavConverter().convert(html) == 'x\n\ny'
+    assert FooterConverter().convert(html).endswith('footer')
+
+
+def test_iter_convert_soup():
+    soup = BeautifulSoup('<p>one</p><p>two</p>', 'html.parser')
+    assert list(MarkdownConverter().iter_convert_soup(soup)) == ['one', '\n\ntwo']
+    assert list(MarkdownConverter().iter_convert_soup(soup.p)) == ['\n\none\n\n']
+
+
+def test_convert_to():
+    html = '<p>caf\xe9</p><p>two</p>'
+    text = io.StringIO()
+    MarkdownConverter().convert_to(html, text)
+    assert text.getvalue() == 'caf\xe9\n\ntwo'
+
+    binary = io.BytesIO()
+    convert_to(html, binary, encoding='utf-16', heading_style='atx')
+    assert binary.getvalue() == 'caf\xe9\n\ntwo'.encode('utf-16')
+
+    compressed = io.BytesIO()
+    with gzip.GzipFile(fileobj=compressed, mode='wb') as f:
+        convert_to(html.encode('utf-8'), f)
+    assert gzip.decompress(compressed.getvalue()) == 'caf\xe9\n\ntwo'.encode('utf-8')
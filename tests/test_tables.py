@@ -1,3 +1,4 @@
+from markdownify import MarkdownConverter
 from .utils import md
 
 
@@ -284,6 +285,18 @@ table_with_colspan_missing_head = """<table>
     </tr>
 </table>"""
 
+table_multiple_bodies = """<table>
+    <thead>
+        <tr><td>Head</td></tr>
+    </thead>
+    <tbody>
+        <tr><td>One</td></tr>
+    </tbody>
+    <tbody>
+        <tr><td>Two</td></tr>
+    </tbody>
+</table>"""
+
 
 def test_table():
     assert md(table) == '\n\n| Firstname | Lastname | Age |\n| --- | --- | --- |\n| Jill | Smith | 50 |\n| Eve | Jackson | 94 |\n\n'
@@ -319,3 +332,28 @@ def test_table_infer_header():
     assert md(table_with_colspan, table_infer_header=True) == '\n\n| Name | | Age |\n| --- | --- | --- |\n| Jill | Smith | 50 |\n| Eve | Jackson | 94 |\n\n'
     assert md(table_with_undefined_colspan, table_infer_header=True) == '\n\n| Name | Age |\n| --- | --- |\n| Jill | Smith |\n\n'
     assert md(table_with_colspan_missing_head, table_infer_header=True) == '\n\n| Name | | Age |\n| --- | --- | --- |\n| Jill | Smith | 50 |\n| Eve | Jackson | 94 |\n\n'
+
+
+def test_table_multiple_bodies():
+    assert md(table_multiple_bodies) == '\n\n| Head |\n| --- |\n| One |\n| Two |\n\n'
+    assert md(table_multiple_bodies, table_infer_header=True) == '\n\n| Head |\n| --- |\n| One |\n| Two |\n\n'
+
+
+class PlainParentTagsConverter(MarkdownConverter):
+    """
+    Create a custom MarkdownConverter that hides the context tracked by
+    process_tag() from convert_tr()
+    """
+    def convert_tr(self, el, text, parent_tags):
+        return super().convert_tr(el, text, set(parent_tags))
+
+
+def test_tr_outside_traversal():
+    tables = [table, table_with_html_content, table_with_paragraphs, table_with_linebreaks,
+              table_with_header_column, table_head_body, table_head_body_missing_head,
+              table_head_body_multiple_head, table_missing_text, table_missing_head, table_body,
+              table_with_caption, table_with_colspan, table_with_undefined_colspan,
+              table_with_colspan_missing_head, table_multiple_bodies]
+    for html in tables:
+        for infer in (False, True):
+            assert PlainParentTagsConverter(table_infer_header=infer).convert(html) == md(html, table_infer_header=infer, strip_document='strip')
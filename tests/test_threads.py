@@ -0,0 +1,54 @@
+"""
+Sharing one converter between threads.
+
+"""
+from concurrent.futures import ThreadPoolExecutor
+import pickle
+import sys
+
+import pytest
+
+from markdownify import MarkdownConverter
+
+
+DOCUMENTS = [
+    '<h1>Title %d</h1><p>Some <b>bold</b> and <i>italic</i> text.</p>',
+    '<ol start="%d"><li>a</li><li>b<ul><li>c</li></ul></li></ol>',
+    '<table><tr><th>h</th></tr><tr><td>%d</td></tr></table>',
+    '<pre>x = %d\n\n\ny</pre><blockquote><p>q</p></blockquote>',
+    '<h3>a_b %d</h3><a href="http://example.com">link</a> 1. <code>c*d</code>',
+]
+
+
+def test_options_read_only():
+    converter = MarkdownConverter(bullets='-')
+    with pytest.raises(TypeError):
+        converter.options['bullets'] = '+'
+    assert converter.options['bullets'] == '-'
+
+
+def test_pickle():
+    converter = MarkdownConverter(heading_style='atx')
+    converter.convert('<h1>T</h1>')
+    copy = pickle.loads(pickle.dumps(converter))
+    assert copy.options == converter.options
+    assert copy.convert('<h2>T</h2><b>x</b>') == '## T\n\n**x**'
+    with pytest.raises(TypeError):
+        copy.options['bullets'] = '+'
+
+
+def test_shared_converter():
+    converter = MarkdownConverter(heading_style='atx', escape_misc=True)
+    htmls = [doc % i for i in range(200) for doc in DOCUMENTS]
+    expected = [MarkdownConverter(heading_style='atx', escape_misc=True).convert(html)
+                for html in htmls]
+
+    # switch threads often, to interleave the conversions
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        with ThreadPoolExecutor(16) as executor:
+            for _ in range(3):
+                assert list(executor.map(converter.convert, htmls)) == expected
+    finally:
+        sys.setswitchinterval(interval)
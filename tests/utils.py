@@ -7,3 +7,39 @@ def md(html, **options):
     options = {"strip_document": None, **options}
 
     return MarkdownConverter(**options).convert(html)
+
+
+# converters overriding the conversion, shared by the tests of the features
+# that must respect overrides
+class UpperConverter(MarkdownConverter):
+    def process_element(self, node, parent_tags=None):
+        return super().process_element(node, parent_tags=parent_tags).upper()
+
+
+class UpperBoldConverter(MarkdownConverter):
+    def convert_b(self, el, text, parent_tags):
+        return text.upper()
+
+
+class CountingConverter(MarkdownConverter):
+    def convert_b(self, el, text, parent_tags):
+        self.count = getattr(self, 'count', 0) + 1
+        return super().convert_b(el, text, parent_tags)
+
+
+class FooterConverter(MarkdownConverter):
+    def process_tag(self, node, parent_tags=None):
+        text = super().process_tag(node, parent_tags=parent_tags)
+        return text + '\n\nfooter' if node.name == '[document]' else text
+
+
+class NoNavConverter(MarkdownConverter):
+    def convert_soup(self, soup):
+        for nav in soup.find_all('nav'):
+            nav.decompose()
+        return super().convert_soup(soup)
+
+
+class PrefixConverter(MarkdownConverter):
+    def convert(self, html):
+        return '> ' + super().convert(html)